@@ -2,24 +2,237 @@
 FastAPI REST API for PubLog Data
 Provides endpoints for external applications to query PubLog data
 """
-from fastapi import FastAPI, HTTPException, Query, Path
+from anyio import to_thread
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from fastapi import FastAPI, HTTPException, Query, Path, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, AsyncIterator
+from datetime import datetime, timezone
+import duckdb
+import hashlib
+import json
 import logging
+import pyarrow as pa
 
-from config import API_PREFIX, DEFAULT_PAGE_SIZE, MAX_SEARCH_RESULTS
+from cache import TTLCache
+from config import (
+    API_PREFIX, API_THREADPOOL_SIZE, DB_PATH, HEALTH_REFRESH_INTERVAL, DEFAULT_PAGE_SIZE, MAX_SEARCH_RESULTS,
+    RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, STREAM_BATCH_SIZE
+)
 from data_loader import (
     CAGEService, FSCService, NSNService, ItemNameService,
     UnifiedSearchService, DataLoader
 )
-from database import get_db
+from database import get_db, DuckDBPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class Services:
+    """Data services shared by every request, built once in lifespan"""
+    cage: CAGEService
+    fsc: FSCService
+    nsn: NSNService
+    inc: ItemNameService
+    search: UnifiedSearchService
+
+    @classmethod
+    def create(cls) -> "Services":
+        cage, fsc, nsn, inc = CAGEService(), FSCService(), NSNService(), ItemNameService()
+        return cls(
+            cage=cage, fsc=fsc, nsn=nsn, inc=inc,
+            search=UnifiedSearchService(cage, fsc, nsn, inc),
+        )
+
+
+def get_services(request: Request) -> Services:
+    """Dependency returning the app's shared services"""
+    return request.app.state.services
+
+
+def load_reference_lists(app: FastAPI):
+    """Pre-serialize the FSG/FSC listings, which only change on re-index"""
+    app.state.reference_lists = {}
+    for name in REFERENCE_LOADERS:
+        try:
+            reference_list_body(app, name)
+        except Exception as e:
+            logger.warning(f"Could not preload {name} listing: {e}")
+
+
+def reference_list_body(app: FastAPI, name: str) -> bytes:
+    """Get the JSON body for a reference listing, building it on first use"""
+    body = app.state.reference_lists.get(name)
+    if body is None:
+        rows = REFERENCE_LOADERS[name](app.state.services)
+        body = JSONResponse({"data": rows, "count": len(rows)}).body
+        app.state.reference_lists[name] = body
+    return body
+
+
+def refresh_index_version(app: FastAPI):
+    """Fingerprint the indexed data so ETags change whenever it is re-indexed"""
+    mtime = DB_PATH.stat().st_mtime_ns if DB_PATH.exists() else 0
+    app.state.index_version = f"{DB_PATH}:{mtime}"
+
+
+def etag_for(request: Request) -> str:
+    """Weak ETag for this URL under the current index version"""
+    key = f"{request.app.state.index_version}|{request.url.path}?{request.url.query}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+
+def check_etag(request: Request, response: Response):
+    """Dependency answering 304 when the client already has this version"""
+    tag = etag_for(request)
+    if request.headers.get("if-none-match") == tag:
+        raise HTTPException(status_code=304, headers={"ETag": tag})
+    response.headers["ETag"] = tag
+
+
+def check_health(app: FastAPI):
+    """Re-check the database and re-serialize the /health response body
+
+    Only status changes are logged, so a persistently failing database
+    does not log on every tick.
+    """
+    error = None
+    try:
+        tables = get_db().get_indexed_tables()
+        fields = {"status": "healthy", "database_connected": True, "indexed_tables": len(tables)}
+    except Exception as e:
+        error = e
+        fields = {"status": "unhealthy", "database_connected": False, "indexed_tables": 0}
+
+    health = HealthResponse(timestamp=datetime.now(timezone.utc).isoformat(), **fields)
+    previous = getattr(app.state, "health", None)
+    if error is not None and (previous is None or previous.status != health.status):
+        logger.error(f"Health check failed: {error}")
+    elif error is None and previous is not None and previous.status != health.status:
+        logger.info("Health check recovered")
+
+    app.state.health = health
+    app.state.health_body = health.model_dump_json().encode()
+
+
+async def refresh_health(app: FastAPI):
+    """Keep the /health body current so the endpoint never touches the database"""
+    while True:
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+        await to_thread.run_sync(check_health, app)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the DuckDB cursor pool and warm reference data on startup"""
+    # Handlers are sync and run on the threadpool so DuckDB calls never block the loop
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    app.state.db_pool = DuckDBPool(get_db())
+    app.state.services = Services.create()
+    refresh_index_version(app)
+    load_reference_lists(app)
+    check_health(app)
+    health_task = asyncio.create_task(refresh_health(app))
+    yield
+    health_task.cancel()
+    app.state.db_pool.close()
+
+
+async def get_conn(request: Request) -> AsyncIterator[duckdb.DuckDBPyConnection]:
+    """Dependency that checks out a pooled DuckDB cursor for one request"""
+    pool: DuckDBPool = request.app.state.db_pool
+    conn = await pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+async def stream_query(request: Request, sql: str, params: Optional[List] = None,
+                       **extra: Any) -> StreamingResponse:
+    """Run a query and stream its rows as {"data": [...], "count": n, **extra}
+
+    The query is executed up front so SQL errors still raise here, before
+    any bytes are sent; rows are then fetched STREAM_BATCH_SIZE at a time
+    so only one batch is held in memory. The cursor goes back to the pool
+    when the body finishes, or from the background task if the body is
+    never iterated, whichever comes first.
+    """
+    pool: DuckDBPool = request.app.state.db_pool
+    conn = await pool.acquire()
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            pool.release(conn)
+
+    try:
+        cursor = await to_thread.run_sync(conn.execute, sql, params or [])
+        columns = [desc[0] for desc in cursor.description]
+    except Exception:
+        release()
+        raise
+
+    def encode(batch) -> bytes:
+        # One dumps() call per batch; strip the list brackets to splice into "data"
+        rows = [dict(zip(columns, row)) for row in batch]
+        return json.dumps(rows, default=jsonable_encoder, separators=(",", ":")).encode()[1:-1]
+
+    async def body():
+        count = 0
+        try:
+            yield b'{"data":['
+            while batch := await to_thread.run_sync(cursor.fetchmany, STREAM_BATCH_SIZE):
+                yield (b"," if count else b"") + encode(batch)
+                count += len(batch)
+            # Close the array and append the remaining keys of the object
+            yield b"]," + json.dumps({"count": count, **extra}).encode()[1:]
+        finally:
+            release()
+
+    return StreamingResponse(body(), media_type="application/json", background=BackgroundTask(release))
+
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(request: Request) -> bool:
+    """Whether the client asked for an Arrow IPC stream instead of JSON"""
+    return ARROW_STREAM in request.headers.get("accept", "")
+
+
+async def arrow_query(request: Request, sql: str, params: Optional[List] = None) -> Response:
+    """Run a query and return its result as an Arrow IPC stream
+
+    Columns go from DuckDB to the wire without being turned into Python
+    rows; clients read it with pyarrow.ipc.open_stream().
+    """
+    def run(conn: duckdb.DuckDBPyConnection) -> bytes:
+        table = get_db().query_arrow(sql, params, conn=conn)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    pool: DuckDBPool = request.app.state.db_pool
+    conn = await pool.acquire()
+    try:
+        body = await to_thread.run_sync(run, conn)
+    finally:
+        pool.release(conn)
+    return Response(content=body, media_type=ARROW_STREAM)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="PubLog API",
@@ -38,8 +251,47 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
+# Cached GET responses keyed by full URL: (body, headers)
+response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+
+def cache(timeout: int = RESPONSE_CACHE_TTL):
+    """Mark a GET endpoint's responses as cacheable for `timeout` seconds"""
+    def decorator(func):
+        func.cache_timeout = timeout
+        return func
+    return decorator
+
+
+# Registered before CORS so CORS headers are still computed per request
+@app.middleware("http")
+async def response_cache_middleware(request: Request, call_next):
+    """Serve repeat GETs of @cache-marked endpoints from memory"""
+    if request.method != "GET":
+        return await call_next(request)
+
+    key = str(request.url)
+    cached = response_cache.get(key)
+    if cached is not None:
+        body, headers = cached
+        if "etag" in headers and request.headers.get("if-none-match") == headers["etag"]:
+            return Response(status_code=304, headers={"ETag": headers["etag"]})
+        return Response(content=body, headers=headers)
+
+    response = await call_next(request)
+    timeout = getattr(request.scope.get("endpoint"), "cache_timeout", None)
+    if timeout is None or response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = dict(response.headers)
+    headers["cache-control"] = f"max-age={timeout}"
+    response_cache.set(key, (body, headers), ttl=timeout)
+    return Response(content=body, headers=headers)
+
 # CORS middleware for cross-origin requests
 app.add_middleware(
     CORSMiddleware,
@@ -49,24 +301,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-cage_service = CAGEService()
-fsc_service = FSCService()
-nsn_service = NSNService()
-item_name_service = ItemNameService()
-search_service = UnifiedSearchService()
+# Static reference listings served from pre-serialized bytes
+REFERENCE_LOADERS = {
+    "fsg": lambda services: services.fsc.get_all_fsg(),
+    "fsc": lambda services: services.fsc.get_all_fsc(),
+}
 
 
 # ============== Pydantic Models ==============
 
+def json_model(model: BaseModel) -> Response:
+    """Serialize a response model directly with pydantic-core
+
+    Rows come straight from DuckDB, so handlers build models with
+    model_construct() and skip FastAPI's validate-then-encode pass.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     status: str
     timestamp: str
     database_connected: bool
     indexed_tables: int
 
 
+class ListResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    data: List[Dict[str, Any]]
+    count: int
+
+
 class PaginatedResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     data: List[Dict[str, Any]]
     count: int
     limit: int
@@ -74,12 +345,16 @@ class PaginatedResponse(BaseModel):
 
 
 class SearchResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     query: str
     results: Dict[str, List[Dict[str, Any]]]
     total_results: int
 
 
 class CAGERecord(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     CAGE_CODE: str
     CAGE_STATUS: Optional[str] = None
     TYPE: Optional[str] = None
@@ -92,16 +367,22 @@ class CAGERecord(BaseModel):
 
 
 class FSCRecord(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     FSC: str
     FSC_NAME: Optional[str] = None
 
 
 class FSGRecord(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     FSG: str
     FSG_NAME: Optional[str] = None
 
 
 class DatabaseStats(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     total_tables: int
     total_rows: int
     tables: List[Dict[str, Any]]
@@ -111,55 +392,42 @@ class DatabaseStats(BaseModel):
 # ============== Health & Status Endpoints ==============
 
 @app.get(f"{API_PREFIX}/health", response_model=HealthResponse, tags=["System"])
-async def health_check():
-    """Check API health and database connection status"""
-    try:
-        db = get_db()
-        tables = db.get_indexed_tables()
-        return HealthResponse(
-            status="healthy",
-            timestamp=datetime.utcnow().isoformat(),
-            database_connected=True,
-            indexed_tables=len(tables)
-        )
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return HealthResponse(
-            status="unhealthy",
-            timestamp=datetime.utcnow().isoformat(),
-            database_connected=False,
-            indexed_tables=0
-        )
+async def health_check(request: Request):
+    """Check API health and database connection status
+
+    Database status is refreshed every HEALTH_REFRESH_INTERVAL seconds by a
+    background task, which also pre-serializes the body; `timestamp` is the
+    time of that last check.
+    """
+    return Response(content=request.app.state.health_body, media_type="application/json")
 
 
 @app.get(f"{API_PREFIX}/stats", response_model=DatabaseStats, tags=["System"])
-async def get_database_stats():
+def get_database_stats(conn: duckdb.DuckDBPyConnection = Depends(get_conn)):
     """Get database statistics including table counts and sizes"""
     try:
-        db = get_db()
-        return db.get_database_stats()
+        return get_db().get_database_stats(conn=conn)
     except Exception as e:
         logger.error(f"Stats retrieval failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get(f"{API_PREFIX}/tables", tags=["System"])
-async def list_tables():
+@cache(timeout=60)
+def list_tables(conn: duckdb.DuckDBPyConnection = Depends(get_conn)):
     """List all indexed tables"""
     try:
-        db = get_db()
-        tables = db.get_indexed_tables()
+        tables = get_db().get_indexed_tables(conn=conn)
         return {"tables": tables, "count": len(tables)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get(f"{API_PREFIX}/tables/{{table_name}}/info", tags=["System"])
-async def get_table_info(table_name: str):
+def get_table_info(table_name: str, conn: duckdb.DuckDBPyConnection = Depends(get_conn)):
     """Get information about a specific table"""
     try:
-        db = get_db()
-        info = db.get_table_info(table_name)
+        info = get_db().get_table_info(table_name, conn=conn)
         if not info:
             raise HTTPException(status_code=404, detail=f"Table {table_name} not found")
         return info
@@ -174,20 +442,21 @@ async def get_table_info(table_name: str):
 @app.get(f"{API_PREFIX}/search", response_model=SearchResponse, tags=["Search"])
 async def unified_search(
     q: str = Query(..., min_length=1, description="Search query"),
-    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS, description="Results per category")
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS, description="Results per category"),
+    services: Services = Depends(get_services)
 ):
     """
     Search across all data types (CAGE, NSN, FSC, Item Names).
     Returns results grouped by category.
     """
     try:
-        results = search_service.search_all(q, limit=limit)
+        results = await services.search.search_all_async(q, limit=limit)
         total = sum(len(v) for v in results.values())
-        return SearchResponse(
+        return json_model(SearchResponse.model_construct(
             query=q,
             results=results,
             total_results=total
-        )
+        ))
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -196,54 +465,53 @@ async def unified_search(
 # ============== CAGE Endpoints ==============
 # Note: Specific paths must come before parameterized paths
 
-@app.get(f"{API_PREFIX}/cage/search", tags=["CAGE"])
-async def search_cage(
+@app.get(f"{API_PREFIX}/cage/search", response_model=PaginatedResponse, tags=["CAGE"])
+def search_cage(
     q: str = Query(..., min_length=1, description="Search query (company name, city, or code)"),
     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    services: Services = Depends(get_services)
 ):
     """Search CAGE records by company name, city, or code"""
-    results = cage_service.search(q, limit=limit, offset=offset)
-    return {
-        "data": results,
-        "count": len(results),
-        "limit": limit,
-        "offset": offset
-    }
+    results = services.cage.search(q, limit=limit, offset=offset)
+    return json_model(PaginatedResponse.model_construct(
+        data=results, count=len(results), limit=limit, offset=offset
+    ))
 
 
-@app.get(f"{API_PREFIX}/cage/location", tags=["CAGE"])
-async def search_cage_by_location(
+@app.get(f"{API_PREFIX}/cage/location", response_model=PaginatedResponse, tags=["CAGE"])
+def search_cage_by_location(
     state: Optional[str] = Query(None, description="State/Province code"),
     city: Optional[str] = Query(None, description="City name"),
     country: Optional[str] = Query(None, description="Country name"),
-    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS),
+    services: Services = Depends(get_services)
 ):
     """Search CAGE records by location"""
     if not any([state, city, country]):
         raise HTTPException(status_code=400, detail="At least one location parameter required")
 
-    results = cage_service.search_by_location(state=state, city=city, country=country, limit=limit)
-    return {
-        "data": results,
-        "count": len(results),
-        "limit": limit,
-        "offset": 0
-    }
+    results = services.cage.search_by_location(state=state, city=city, country=country, limit=limit)
+    return json_model(PaginatedResponse.model_construct(
+        data=results, count=len(results), limit=limit, offset=0
+    ))
 
 
 @app.get(f"{API_PREFIX}/cage/stats", tags=["CAGE"])
-async def get_cage_stats():
+@cache(timeout=600)
+def get_cage_stats(services: Services = Depends(get_services)):
     """Get CAGE statistics (counts by status, top countries)"""
-    return cage_service.get_stats()
+    return services.cage.get_stats()
 
 
-@app.get(f"{API_PREFIX}/cage/{{cage_code}}", tags=["CAGE"])
-async def get_cage_by_code(
-    cage_code: str = Path(..., min_length=5, max_length=5, description="5-character CAGE code")
+@app.get(f"{API_PREFIX}/cage/{{cage_code}}", tags=["CAGE"], dependencies=[Depends(check_etag)])
+@cache()
+def get_cage_by_code(
+    cage_code: str = Path(..., min_length=5, max_length=5, description="5-character CAGE code"),
+    services: Services = Depends(get_services)
 ):
     """Get CAGE record by code"""
-    result = cage_service.get_by_code(cage_code)
+    result = services.cage.get_by_code(cage_code)
     if not result:
         raise HTTPException(status_code=404, detail=f"CAGE code {cage_code} not found")
     return result
@@ -252,141 +520,177 @@ async def get_cage_by_code(
 # ============== FSC/FSG Endpoints ==============
 # Note: Specific paths must come before parameterized paths
 
-@app.get(f"{API_PREFIX}/fsg", tags=["FSC/FSG"])
-async def list_all_fsg():
+@app.get(f"{API_PREFIX}/fsg", tags=["FSC/FSG"], dependencies=[Depends(check_etag)])
+@cache()
+def list_all_fsg(request: Request):
     """List all Federal Supply Groups"""
-    results = fsc_service.get_all_fsg()
-    return {"data": results, "count": len(results)}
+    return Response(
+        content=reference_list_body(request.app, "fsg"),
+        media_type="application/json",
+        headers={"ETag": etag_for(request)},
+    )
 
 
-@app.get(f"{API_PREFIX}/fsc", tags=["FSC/FSG"])
-async def list_all_fsc():
+@app.get(f"{API_PREFIX}/fsc", tags=["FSC/FSG"], dependencies=[Depends(check_etag)])
+@cache()
+def list_all_fsc(request: Request):
     """List all Federal Supply Classes"""
-    results = fsc_service.get_all_fsc()
-    return {"data": results, "count": len(results)}
+    return Response(
+        content=reference_list_body(request.app, "fsc"),
+        media_type="application/json",
+        headers={"ETag": etag_for(request)},
+    )
 
 
-@app.get(f"{API_PREFIX}/fsc/search", tags=["FSC/FSG"])
-async def search_fsc(
-    q: str = Query(..., min_length=1, description="Search query")
+@app.get(f"{API_PREFIX}/fsc/search", response_model=ListResponse, tags=["FSC/FSG"])
+def search_fsc(
+    q: str = Query(..., min_length=1, description="Search query"),
+    services: Services = Depends(get_services)
 ):
     """Search FSC by name or code"""
-    results = fsc_service.search_fsc(q)
-    return {"data": results, "count": len(results)}
+    results = services.fsc.search_fsc(q)
+    return json_model(ListResponse.model_construct(data=results, count=len(results)))
 
 
-@app.get(f"{API_PREFIX}/fsg/{{fsg_code}}/fsc", tags=["FSC/FSG"])
-async def get_fsc_by_fsg(
-    fsg_code: str = Path(..., min_length=2, max_length=2, description="2-digit FSG code")
+@app.get(f"{API_PREFIX}/fsg/{{fsg_code}}/fsc", response_model=ListResponse, tags=["FSC/FSG"])
+def get_fsc_by_fsg(
+    fsg_code: str = Path(..., min_length=2, max_length=2, description="2-digit FSG code"),
+    services: Services = Depends(get_services)
 ):
     """Get all FSCs within a Federal Supply Group"""
-    results = fsc_service.get_fsc_by_fsg(fsg_code)
-    return {"data": results, "count": len(results)}
+    results = services.fsc.get_fsc_by_fsg(fsg_code)
+    return json_model(ListResponse.model_construct(data=results, count=len(results)))
 
 
-@app.get(f"{API_PREFIX}/fsc/{{fsc_code}}", tags=["FSC/FSG"])
-async def get_fsc_by_code(
-    fsc_code: str = Path(..., min_length=4, max_length=4, description="4-digit FSC code")
+@app.get(f"{API_PREFIX}/fsc/{{fsc_code}}", tags=["FSC/FSG"], dependencies=[Depends(check_etag)])
+@cache()
+def get_fsc_by_code(
+    fsc_code: str = Path(..., min_length=4, max_length=4, description="4-digit FSC code"),
+    services: Services = Depends(get_services)
 ):
     """Get FSC details by code"""
-    result = fsc_service.get_fsc_by_code(fsc_code)
+    result = services.fsc.get_fsc_by_code(fsc_code)
     if not result:
         raise HTTPException(status_code=404, detail=f"FSC {fsc_code} not found")
     return result
 
 
 # ============== NSN Endpoints ==============
+# Note: Specific paths must come before parameterized paths
+
+@app.get(f"{API_PREFIX}/nsn/search", response_model=PaginatedResponse, tags=["NSN"])
+async def search_nsn(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Search query (NIIN or item name)"),
+    fsc: Optional[str] = Query(None, min_length=4, max_length=4, description="Filter by FSC"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0),
+    services: Services = Depends(get_services)
+):
+    """Search NSN records by NIIN or item name
 
-@app.get(f"{API_PREFIX}/nsn/{{niin}}", tags=["NSN"])
-async def get_nsn_by_niin(
-    niin: str = Path(..., min_length=9, max_length=9, description="9-digit NIIN")
+    Send `Accept: application/vnd.apache.arrow.stream` to get the rows as an
+    Arrow IPC stream instead of JSON.
+    """
+    # Arrow and pages larger than one batch skip building Python row dicts
+    arrow = wants_arrow(request)
+    if (arrow or limit > STREAM_BATCH_SIZE) and await to_thread.run_sync(get_db().is_table_indexed, "P_FLIS_NSN"):
+        sql, params = services.nsn.search_sql(q, fsc=fsc, limit=limit, offset=offset)
+        try:
+            if arrow:
+                return await arrow_query(request, sql, params)
+            return await stream_query(request, sql, params, limit=limit, offset=offset)
+        except Exception as e:
+            logger.error(f"NSN search error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    results = await to_thread.run_sync(
+        lambda: services.nsn.search(q, fsc=fsc, limit=limit, offset=offset)
+    )
+    return json_model(PaginatedResponse.model_construct(
+        data=results, count=len(results), limit=limit, offset=offset
+    ))
+
+
+@app.get(f"{API_PREFIX}/nsn/{{niin}}", tags=["NSN"], dependencies=[Depends(check_etag)])
+@cache()
+def get_nsn_by_niin(
+    niin: str = Path(..., min_length=9, max_length=9, description="9-digit NIIN"),
+    services: Services = Depends(get_services)
 ):
     """Get NSN record by NIIN (National Item Identification Number)"""
-    result = nsn_service.get_by_niin(niin)
+    result = services.nsn.get_by_niin(niin)
     if not result:
         raise HTTPException(status_code=404, detail=f"NIIN {niin} not found")
     return result
 
 
-@app.get(f"{API_PREFIX}/nsn/search", tags=["NSN"])
-async def search_nsn(
-    q: str = Query(..., min_length=1, description="Search query (NIIN or item name)"),
-    fsc: Optional[str] = Query(None, min_length=4, max_length=4, description="Filter by FSC"),
-    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS),
-    offset: int = Query(0, ge=0)
-):
-    """Search NSN records by NIIN or item name"""
-    results = nsn_service.search(q, fsc=fsc, limit=limit, offset=offset)
-    return {
-        "data": results,
-        "count": len(results),
-        "limit": limit,
-        "offset": offset
-    }
-
-
-@app.get(f"{API_PREFIX}/nsn/fsc/{{fsc_code}}", tags=["NSN"])
-async def get_nsn_by_fsc(
+@app.get(f"{API_PREFIX}/nsn/fsc/{{fsc_code}}", response_model=PaginatedResponse, tags=["NSN"])
+def get_nsn_by_fsc(
     fsc_code: str = Path(..., min_length=4, max_length=4, description="4-digit FSC code"),
     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    services: Services = Depends(get_services)
 ):
     """Get NSN records by Federal Supply Class"""
-    results = nsn_service.get_by_fsc(fsc_code, limit=limit, offset=offset)
-    return {
-        "data": results,
-        "count": len(results),
-        "limit": limit,
-        "offset": offset
-    }
-
-
-@app.get(f"{API_PREFIX}/nsn/{{niin}}/management", tags=["NSN"])
-async def get_nsn_management_data(
-    niin: str = Path(..., min_length=9, max_length=9, description="9-digit NIIN")
+    results = services.nsn.get_by_fsc(fsc_code, limit=limit, offset=offset)
+    return json_model(PaginatedResponse.model_construct(
+        data=results, count=len(results), limit=limit, offset=offset
+    ))
+
+
+@app.get(f"{API_PREFIX}/nsn/{{niin}}/management", response_model=ListResponse, tags=["NSN"])
+def get_nsn_management_data(
+    niin: str = Path(..., min_length=9, max_length=9, description="9-digit NIIN"),
+    services: Services = Depends(get_services)
 ):
     """Get management data (pricing, units, service data) for a NIIN"""
-    results = nsn_service.get_management_data(niin)
-    return {"data": results, "count": len(results)}
+    results = services.nsn.get_management_data(niin)
+    return json_model(ListResponse.model_construct(data=results, count=len(results)))
 
 
-@app.get(f"{API_PREFIX}/nsn/{{niin}}/characteristics", tags=["NSN"])
-async def get_nsn_characteristics(
-    niin: str = Path(..., min_length=9, max_length=9, description="9-digit NIIN")
+@app.get(f"{API_PREFIX}/nsn/{{niin}}/characteristics", response_model=ListResponse, tags=["NSN"])
+def get_nsn_characteristics(
+    niin: str = Path(..., min_length=9, max_length=9, description="9-digit NIIN"),
+    services: Services = Depends(get_services)
 ):
     """Get characteristics data for a NIIN"""
-    results = nsn_service.get_characteristics(niin)
-    return {"data": results, "count": len(results)}
+    results = services.nsn.get_characteristics(niin)
+    return json_model(ListResponse.model_construct(data=results, count=len(results)))
 
 
 # ============== Item Name (INC) Endpoints ==============
 # Note: Specific paths must come before parameterized paths
 
-@app.get(f"{API_PREFIX}/inc", tags=["Item Names"])
-async def list_item_names(
-    limit: int = Query(100, ge=1, le=1000)
+@app.get(f"{API_PREFIX}/inc", response_model=ListResponse, tags=["Item Names"])
+def list_item_names(
+    limit: int = Query(100, ge=1, le=1000),
+    services: Services = Depends(get_services)
 ):
     """List item names (limited)"""
-    results = item_name_service.get_all(limit=limit)
-    return {"data": results, "count": len(results)}
+    results = services.inc.get_all(limit=limit)
+    return json_model(ListResponse.model_construct(data=results, count=len(results)))
 
 
-@app.get(f"{API_PREFIX}/inc/search", tags=["Item Names"])
-async def search_inc(
+@app.get(f"{API_PREFIX}/inc/search", response_model=ListResponse, tags=["Item Names"])
+def search_inc(
     q: str = Query(..., min_length=1, description="Search query"),
-    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_RESULTS),
+    services: Services = Depends(get_services)
 ):
     """Search item names by title or definition"""
-    results = item_name_service.search(q, limit=limit)
-    return {"data": results, "count": len(results)}
+    results = services.inc.search(q, limit=limit)
+    return json_model(ListResponse.model_construct(data=results, count=len(results)))
 
 
-@app.get(f"{API_PREFIX}/inc/{{inc_code}}", tags=["Item Names"])
-async def get_inc_by_code(
-    inc_code: str = Path(..., min_length=5, max_length=5, description="5-digit INC code")
+@app.get(f"{API_PREFIX}/inc/{{inc_code}}", tags=["Item Names"], dependencies=[Depends(check_etag)])
+@cache()
+def get_inc_by_code(
+    inc_code: str = Path(..., min_length=5, max_length=5, description="5-digit INC code"),
+    services: Services = Depends(get_services)
 ):
     """Get item name by INC (Item Name Code)"""
-    result = item_name_service.get_by_inc(inc_code)
+    result = services.inc.get_by_inc(inc_code)
     if not result:
         raise HTTPException(status_code=404, detail=f"INC {inc_code} not found")
     return result
@@ -394,33 +698,27 @@ async def get_inc_by_code(
 
 # ============== Raw Query Endpoint (Admin) ==============
 
-@app.post(f"{API_PREFIX}/query", tags=["Admin"])
+@app.post(f"{API_PREFIX}/query", response_model=ListResponse, tags=["Admin"])
 async def execute_query(
+    request: Request,
     sql: str = Query(..., description="SQL query to execute"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum rows to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum rows to return"),
 ):
     """
     Execute a raw SQL query (read-only, for admin/debugging).
     Query is limited to SELECT statements only.
+    Send `Accept: application/vnd.apache.arrow.stream` for an Arrow IPC stream.
     """
-    # Basic SQL injection protection
-    sql_upper = sql.strip().upper()
-    if not sql_upper.startswith("SELECT"):
-        raise HTTPException(status_code=400, detail="Only SELECT queries are allowed")
-
-    forbidden = ["INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER", "TRUNCATE"]
-    for word in forbidden:
-        if word in sql_upper:
-            raise HTTPException(status_code=400, detail=f"{word} statements are not allowed")
-
+    # Parse the statement: single SELECT only, LIMIT added if absent
     try:
-        db = get_db()
-        # Add LIMIT if not present
-        if "LIMIT" not in sql_upper:
-            sql = f"{sql.rstrip(';')} LIMIT {limit}"
+        sql = await to_thread.run_sync(get_db().prepare_select, sql, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        results = db.query(sql)
-        return {"data": results, "count": len(results)}
+    try:
+        if wants_arrow(request):
+            return await arrow_query(request, sql)
+        return await stream_query(request, sql)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -428,7 +726,8 @@ async def execute_query(
 # ============== Database Initialization ==============
 
 @app.post(f"{API_PREFIX}/admin/initialize", tags=["Admin"])
-async def initialize_database(
+def initialize_database(
+    request: Request,
     force: bool = Query(False, description="Force re-indexing of all tables"),
     priority_only: bool = Query(False, description="Index only priority tables (faster)")
 ):
@@ -439,6 +738,9 @@ async def initialize_database(
     try:
         loader = DataLoader()
         result = loader.initialize_database(force=force, priority_only=priority_only)
+        response_cache.clear()
+        refresh_index_version(request.app)
+        load_reference_lists(request.app)
         return result
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
@@ -9,11 +9,46 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = Path(__file__).parent.parent / "Data"
 # Use temp directory for DuckDB to avoid filesystem permission issues
 DB_PATH = Path("/tmp/publog_index.duckdb")
+# Open an already-built database read-only ("1"). Any number of read-only
+# processes (e.g. several API workers) can share the file, but DuckDB does not
+# let them open it while another process holds it read-write, and indexing is
+# unavailable in this mode.
+DB_READ_ONLY = os.environ.get("PUBLOG_DB_READONLY") == "1"
+
+# DuckDB resource settings; None keeps DuckDB's own default
+DUCKDB_THREADS = os.cpu_count()
+DUCKDB_MEMORY_LIMIT = os.environ.get("PUBLOG_DUCKDB_MEMORY_LIMIT")  # e.g. "8GB"
+DUCKDB_TEMP_DIRECTORY = os.environ.get("PUBLOG_DUCKDB_TEMP_DIR")  # spill space for large loads
+INDEX_WORKERS = min(4, os.cpu_count() or 1)  # CSV files loaded concurrently
+
+# Parquet copies of loaded CSVs; re-indexing reads these instead of re-parsing
+# the CSV while the CSV is unchanged. Set to None to disable.
+PARQUET_CACHE_DIR = Path("/tmp/publog_parquet")
 
 # API Configuration
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 API_PREFIX = "/api/v1"
+API_THREADPOOL_SIZE = 64  # worker threads for blocking request handlers
+STREAM_BATCH_SIZE = 256  # rows fetched per chunk when streaming large results
+
+# In-memory response cache for read-only GET endpoints
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 3600  # seconds; data only changes on re-index
+
+# How long database statistics are reused before re-counting (seconds)
+STATS_CACHE_TTL = 60
+
+# Cached results of point lookups and static reference queries; cleared on re-index
+LOOKUP_CACHE_SIZE = 10000
+LOOKUP_CACHE_TTL = 3600
+
+# Cached search results, keyed on the full query and filters; cleared on re-index
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 3600
+
+# Seconds between background refreshes of the API health status
+HEALTH_REFRESH_INTERVAL = 5
 
 # Data file mappings - organized by category
 DATA_FILES = {
@@ -136,6 +171,89 @@ LARGE_TABLES = [
     "V_FLIS_IDENTIFICATION",
 ]
 
+# Flat table name -> CSV path lookup over all DATA_FILES categories
+TABLE_PATHS = {name: path for files in DATA_FILES.values() for name, path in files.items()}
+
+assert set(PRIORITY_TABLES) <= TABLE_PATHS.keys(), "PRIORITY_TABLES has a table missing from DATA_FILES"
+assert set(LARGE_TABLES) <= TABLE_PATHS.keys(), "LARGE_TABLES has a table missing from DATA_FILES"
+
+# Column types pinned at load time instead of sniffed from a sample: codes
+# keep leading zeros as VARCHAR, and FSC stays INTEGER for the FSC = ? lookups.
+# Columns missing from a CSV's header are ignored.
+TABLE_COLUMN_TYPES = {
+    "P_CAGE": {"CAGE_CODE": "VARCHAR", "ZIP_POSTAL_ZONE": "VARCHAR"},
+    "V_H2_FSC": {"FSC": "INTEGER"},
+    "V_H2_FSG": {"FSC": "INTEGER"},
+    "V_H6_NAME_INC": {"INC": "VARCHAR"},
+    "P_FLIS_NSN": {"NIIN": "VARCHAR", "FSC": "INTEGER", "INC": "VARCHAR"},
+    "V_FLIS_IDENTIFICATION": {"NIIN": "VARCHAR", "FSC": "INTEGER", "INC": "VARCHAR"},
+    "V_FLIS_CANCELLED_NIIN": {"NIIN": "VARCHAR"},
+    "V_FLIS_MANAGEMENT": {"NIIN": "VARCHAR"},
+    "V_FLIS_PART": {"NIIN": "VARCHAR", "CAGE_CODE": "VARCHAR"},
+    "V_CHARACTERISTICS": {"NIIN": "VARCHAR"},
+    "FLISV": {"NIIN": "VARCHAR"},
+}
+
+# Row order tables are stored in, clustering rows on their filter columns so
+# DuckDB's per-row-group min/max (zonemap) checks skip non-matching groups.
+# Columns missing from a CSV's header are ignored.
+TABLE_SORT_KEYS = {
+    "P_CAGE": ["STATE_PROVINCE", "CITY"],
+    "P_FLIS_NSN": ["FSC", "NIIN"],
+    "V_FLIS_MANAGEMENT": ["NIIN"],
+    "V_CHARACTERISTICS": ["NIIN"],
+    "FLISV": ["NIIN"],
+}
+
 # Search configuration
 MAX_SEARCH_RESULTS = 1000
 DEFAULT_PAGE_SIZE = 50
+
+# Columns searched case-insensitively; an uppercase copy <COL>_UC is stored
+# at index time so searches do not run UPPER() on every row
+NORMALIZED_COLUMNS = {
+    "P_CAGE": ["COMPANY", "CITY", "STATE_PROVINCE", "COUNTRY"],
+    "V_H2_FSC": ["FSC_TITLE"],
+    "V_H6_NAME_INC": ["FIIG_TITLE", "DEFINITION"],
+    "P_FLIS_NSN": ["ITEM_NAME"],
+}
+NORMALIZED_SUFFIX = "_UC"
+
+# Full-text (BM25) indexes: table -> (unique id column, indexed text columns)
+FTS_INDEXES = {
+    "P_CAGE": ("CAGE_CODE", ["CAGE_CODE", "COMPANY", "CITY"]),
+    "V_H2_FSC": ("FSC", ["FSC_TITLE"]),  # numeric codes use the FSC = ? path
+    "V_H6_NAME_INC": ("INC", ["INC", "FIIG_TITLE", "DEFINITION"]),
+    "P_FLIS_NSN": ("NIIN", ["NIIN", "ITEM_NAME"]),
+}
+FTS_MIN_QUERY_LENGTH = 3  # shorter queries use LIKE
+
+# Free-text searches shorter than this match most rows, so pages ask for more input
+MIN_TEXT_SEARCH_LENGTH = 3
+
+# Lookup tables derived from the PubLog tables live in their own schema, so
+# table listings and row totals (which read schema main) only show PubLog data
+DERIVED_SCHEMA = "search"
+
+# Word-prefix index used by unified search to shortlist candidate rows.
+# P_FLIS_NSN is left out: item names share a small vocabulary, so a prefix's
+# row list is a large slice of the table and the rowid semi-join costs about
+# as much as the LIKE scan it replaces (its text search goes through FTS).
+# The other sources have full-text indexes too, but the prefix index is kept:
+# digit-only queries skip BM25 (see data_loader._use_fts) and still use it, and
+# it is the only shortlist where the fts extension cannot be installed. It is
+# rebuilt only after one of its source tables is loaded.
+PREFIX_INDEX_TABLE = f"{DERIVED_SCHEMA}.SEARCH_PREFIX_INDEX"
+PREFIX_LENGTH = 4
+PREFIX_INDEX_SOURCES = {
+    "P_CAGE": ["COMPANY", "CITY", "CAGE_CODE"],
+    "V_H2_FSC": ["FSC", "FSC_TITLE"],
+    "V_H6_NAME_INC": ["INC", "FIIG_TITLE", "DEFINITION"],
+}
+
+# Sorted (code, row id) tables answering identifier-prefix lookups; their
+# zonemaps narrow a code range to a row group or two instead of a full scan
+CODE_KEY_TABLES = {
+    "P_CAGE": (f"{DERIVED_SCHEMA}.CAGE_CODE_KEYS", "CAGE_CODE"),
+    "P_FLIS_NSN": (f"{DERIVED_SCHEMA}.NIIN_KEYS", "NIIN"),
+}
@@ -2,16 +2,154 @@
 Data loading and indexing utilities for PubLog Application
 Handles initial data indexing and provides query interfaces
 """
+import asyncio
+import io
 import logging
-from typing import Optional, List, Dict, Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Optional, List, Dict, Any, Tuple, Callable, Sequence
 from pathlib import Path
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
 from database import get_db, PubLogDatabase
-from config import MAX_SEARCH_RESULTS, DEFAULT_PAGE_SIZE
+from config import (
+    MAX_SEARCH_RESULTS, DEFAULT_PAGE_SIZE,
+    DERIVED_SCHEMA, PREFIX_INDEX_TABLE, PREFIX_LENGTH, PREFIX_INDEX_SOURCES, CODE_KEY_TABLES,
+    FTS_INDEXES, FTS_MIN_QUERY_LENGTH, NORMALIZED_COLUMNS, DB_READ_ONLY
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Identifier shapes that unified search answers with exact lookups
+NIIN_RE = re.compile(r"\d{9}")
+CAGE_RE = re.compile(r"(?=.*\d)[A-Z0-9]{5}")  # 5 characters, at least one digit
+FSC_RE = re.compile(r"\d{4}")
+
+# Codes that are compared as integers (FSC/FSG); checked instead of catching int() errors
+DIGITS_RE = re.compile(r"\d+")
+
+
+def _prefix_filter(db: PubLogDatabase, source: str, query: str) -> Tuple[str, List[Any]]:
+    """Build an extra WHERE condition limiting a search to prefix-index candidates
+
+    Candidates are rows with a word starting with the first PREFIX_LENGTH
+    characters of the query's first word. Returns ("", []) when the query
+    word is too short or the prefix index has not been built.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens or len(tokens[0]) < PREFIX_LENGTH or not db.is_table_indexed(PREFIX_INDEX_TABLE):
+        return "", []
+    return (
+        f" AND rowid IN (SELECT row_id FROM {PREFIX_INDEX_TABLE} WHERE prefix = ? AND source = ?)",
+        [tokens[0][:PREFIX_LENGTH], source],
+    )
+
+
+
+def _code_prefix_query(db: PubLogDatabase, table: str, prefix: str, limit: int,
+                       display: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Rows whose identifier column starts with `prefix`, in code order
+
+    The prefix becomes a [prefix, next prefix) range so the sorted key table
+    (CODE_KEY_TABLES) only reads the row groups covering it. Falls back to
+    the same range over the source table while the key table is missing.
+    """
+    key_table, column = CODE_KEY_TABLES[table]
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    columns = db.select_list(table, display)
+    if db.is_table_indexed(key_table):
+        return db.query_prepared(f"""
+            SELECT {columns} FROM {table}
+            WHERE rowid IN (
+                SELECT row_id FROM {key_table}
+                WHERE {column} >= ? AND {column} < ?
+                ORDER BY {column}
+                LIMIT ?
+            )
+            ORDER BY {column}
+        """, [prefix, upper, limit])
+    return db.query_prepared(f"""
+        SELECT {columns} FROM {table}
+        WHERE {column} >= ? AND {column} < ?
+        ORDER BY {column}
+        LIMIT ?
+    """, [prefix, upper, limit])
+
+
+def rows_to_csv(rows: List[Dict[str, Any]]) -> bytes:
+    """Encode result rows as CSV bytes for a download button
+
+    Arrow's CSV writer encodes without a per-cell Python loop; on a 500-row
+    result page it is several times faster than DataFrame.to_csv.
+    """
+    buffer = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pylist(rows), buffer)
+    return buffer.getvalue()
+
+
+def rows_to_frame(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Build a DataFrame for st.dataframe with compact column types
+
+    Streamlit ships the frame to the browser as Arrow. Downcasting integer
+    codes (FSC, INC, counts) and using Arrow-backed strings shrinks that
+    payload and skips converting Python string objects on every rerun.
+    """
+    df = pd.DataFrame(rows, columns=columns)
+    for column in df.select_dtypes("integer"):
+        downcast = "unsigned" if (df[column] >= 0).all() else "integer"
+        df[column] = pd.to_numeric(df[column], downcast=downcast)
+    for column in df.select_dtypes("object"):
+        if pd.api.types.infer_dtype(df[column], skipna=True) == "string":
+            df[column] = df[column].astype("string[pyarrow]")
+    return df
+
+
+def _like_term(query: str) -> str:
+    """Normalize a search query once into an uppercase '%...%' LIKE pattern"""
+    return f"%{query.strip().upper()}%"
+
+
+def _as_list(row: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Wrap a single-row lookup result as a search result list"""
+    return [row] if row else []
+
+
+def _use_fts(db: PubLogDatabase, table: str, query: str) -> bool:
+    """Whether a free-text query should go through the table's BM25 index
+
+    Short queries and bare codes/numbers keep using LIKE, which also
+    matches partial codes.
+    """
+    return (len(query.strip()) >= FTS_MIN_QUERY_LENGTH
+            and any(c.isalpha() for c in query)
+            and db.has_fts_index(table))
+
+
+def _fts_select(db: PubLogDatabase, table: str, where: str = "",
+                display: Optional[Sequence[str]] = None) -> str:
+    """SELECT of rows matching a BM25 query (first param), best match first
+
+    `where` adds extra AND conditions (params after the query); they are
+    applied inside the subquery, so they may use columns that `display`
+    leaves out. LIMIT/OFFSET are left to the caller. `display` limits the
+    selected columns (see PubLogDatabase.select_list).
+    """
+    id_column = FTS_INDEXES[table][0]
+    return f"""
+        SELECT * EXCLUDE (score) FROM (
+            SELECT {db.select_list(table, display)}, fts_main_{table}.match_bm25({id_column}, ?) AS score FROM {table}
+            WHERE TRUE{where}
+        )
+        WHERE score IS NOT NULL
+        ORDER BY score DESC
+    """
 
 class DataLoader:
     """Handles data loading and provides query interfaces"""
@@ -19,17 +157,21 @@ class DataLoader:
     def __init__(self):
         self.db = get_db()
 
-    def initialize_database(self, force: bool = False, priority_only: bool = False) -> Dict[str, Any]:
-        """Initialize the database by indexing all CSV files"""
+    def initialize_database(self, force: bool = False, priority_only: bool = False,
+                            on_table_done: Optional[Callable[[str, bool], None]] = None) -> Dict[str, Any]:
+        """Initialize the database by indexing all CSV files
+
+        on_table_done is passed through to PubLogDatabase.index_tables for
+        per-table progress reporting.
+        """
         logger.info("Starting database initialization...")
 
         if priority_only:
-            results = self.db.index_priority_tables(force)
+            results = self.db.index_priority_tables(force, on_table_done)
         else:
-            results = self.db.index_all_tables(force)
+            results = self.db.index_all_tables(force, on_table_done)
 
-        # Create useful indexes
-        self._create_search_indexes()
+        self.build_search_indexes()
 
         success_count = sum(1 for v in results.values() if v)
         logger.info(f"Indexed {success_count}/{len(results)} tables successfully")
@@ -41,48 +183,214 @@ class DataLoader:
             "details": results
         }
 
-    def _create_search_indexes(self):
-        """Create indexes for common search patterns"""
+    def build_search_indexes(self, table: Optional[str] = None):
+        """(Re)build the indexes derived from loaded tables
+
+        Loading a table drops its full-text, prefix and code-key indexes, so
+        this runs after initialize_database and after any single-table load.
+        Given the table just loaded, only the structures built from it are
+        rebuilt and only it is analyzed, instead of every multi-GB table.
+        """
+        if DB_READ_ONLY:
+            return
+
+        # Start from the catalog as it is now (tables and full-text indexes are cached)
+        self.db.clear_caches()
+
+        # Tables indexed before NORMALIZED_COLUMNS existed get their copies now
+        for name in NORMALIZED_COLUMNS:
+            if table in (None, name) and self.db.is_table_indexed(name):
+                self.db.add_normalized_columns(name)
+
+        self._create_derived_schema()
+        self._create_search_indexes(table)
+        if table is None or table in PREFIX_INDEX_SOURCES:
+            self._create_prefix_index()
+        self._create_code_key_tables(table)
+        self._create_fts_indexes(table)
+        self.db.clear_caches()
+
+        # Fold the WAL into the database file; read-only processes cannot replay it
+        try:
+            self.db.conn.execute("CHECKPOINT")
+        except Exception as e:
+            logger.warning(f"Could not checkpoint database: {e}")
+
+    def _create_derived_schema(self):
+        """Create the schema for derived tables, dropping copies older builds left in main"""
+        try:
+            self.db.conn.execute(f"CREATE SCHEMA IF NOT EXISTS {DERIVED_SCHEMA}")
+            for table in [PREFIX_INDEX_TABLE, *(key for key, _ in CODE_KEY_TABLES.values())]:
+                self.db.conn.execute(f"DROP TABLE IF EXISTS main.{table.split('.')[-1]}")
+        except Exception as e:
+            logger.warning(f"Could not prepare schema {DERIVED_SCHEMA}: {e}")
+
+    def _create_search_indexes(self, only: Optional[str] = None):
+        """Create indexes for the equality lookups the services run
+
+        DuckDB only uses ART indexes for equality/range filters, so text
+        columns searched with LIKE are not indexed; those searches go through
+        the full-text and prefix indexes instead. `only` limits this, and the
+        statistics refresh, to one table.
+        """
         index_definitions = {
-            "P_CAGE": ["CAGE_CODE", "COMPANY", "CITY", "STATE_PROVINCE"],
-            "V_H2_FSC": ["FSC", "FSC_TITLE"],
-            "V_H2_FSG": ["FSG", "FSG_TITLE"],
-            "V_H6_NAME_INC": ["INC", "FIIG_TITLE"],
-            "V_FLIS_IDENTIFICATION": ["NIIN", "FSC", "ITEM_NAME"],
+            "P_CAGE": ["CAGE_CODE", "STATE_PROVINCE_UC"],
+            "V_H2_FSC": ["FSC"],
+            "V_H6_NAME_INC": ["INC"],
             "P_FLIS_NSN": ["NIIN", "FSC"],
-            "FLISV": ["NIIN", "FSC"],
+            "V_FLIS_IDENTIFICATION": ["NIIN"],
+            "V_FLIS_MANAGEMENT": ["NIIN"],
+            "V_CHARACTERISTICS": ["NIIN"],
+            "FLISV": ["NIIN"],
         }
+        # Text-column indexes earlier versions built; databases indexed
+        # before then still carry them until each table is reloaded
+        retired_indexes = {
+            "P_CAGE": ["COMPANY_UC", "CITY_UC", "COUNTRY_UC"],
+            "V_H2_FSC": ["FSC_TITLE"],
+            "V_H2_FSG": ["FSG", "FSG_TITLE"],
+            "V_H6_NAME_INC": ["FIIG_TITLE"],
+            "V_FLIS_IDENTIFICATION": ["FSC", "ITEM_NAME"],
+            "FLISV": ["FSC"],
+        }
+
+        for table, columns in retired_indexes.items():
+            if only in (None, table) and self.db.is_table_indexed(table):
+                self.db.drop_indexes(table, columns)
 
         for table, columns in index_definitions.items():
-            if self.db.is_table_indexed(table):
+            if only in (None, table) and self.db.is_table_indexed(table):
                 self.db.create_indexes(table, columns)
 
+        # Refresh optimizer statistics once after loading and indexing
+        try:
+            self.db.conn.execute(f"ANALYZE {only}" if only else "ANALYZE")
+        except Exception as e:
+            logger.warning(f"Could not analyze database: {e}")
+
+    def _create_fts_indexes(self, only: Optional[str] = None):
+        """Build full-text indexes for free-text search (for one table if `only` is given)"""
+        # Re-indexing a table drops its full-text index, so only build missing ones
+        for table, (id_column, columns) in FTS_INDEXES.items():
+            if only not in (None, table):
+                continue
+            if self.db.is_table_indexed(table) and not self.db.has_fts_index(table):
+                self.db.create_fts_index(table, id_column, columns)
+
+    def _create_prefix_index(self):
+        """Build the word-prefix -> row id table used by unified search
+
+        Loading any source table drops the index, so an existing one is current.
+        """
+        if self.db.is_table_indexed(PREFIX_INDEX_TABLE):
+            return
+
+        selects = []
+        for table, columns in PREFIX_INDEX_SOURCES.items():
+            if not self.db.is_table_indexed(table):
+                continue
+            text = ", ".join(f"CAST({col} AS VARCHAR)" for col in columns)
+            selects.append(f"""
+                SELECT '{table}' AS source, rowid AS row_id,
+                       unnest(regexp_split_to_array(lower(concat_ws(' ', {text})), '[^a-z0-9]+')) AS token
+                FROM {table}
+            """)
+
+        if not selects:
+            return
+
+        try:
+            # DISTINCT keeps one entry per (prefix, row) however often the word repeats
+            self.db.conn.execute(f"""
+                CREATE OR REPLACE TABLE {PREFIX_INDEX_TABLE} AS
+                SELECT DISTINCT substr(token, 1, {PREFIX_LENGTH}) AS prefix, source, row_id
+                FROM ({" UNION ALL ".join(selects)})
+                WHERE length(token) >= {PREFIX_LENGTH}
+            """)
+            self.db.create_indexes(PREFIX_INDEX_TABLE, ["prefix"])
+            self.db.clear_caches()
+            logger.info(f"Built {PREFIX_INDEX_TABLE}")
+        except Exception as e:
+            logger.error(f"Error building prefix index: {e}")
+
+
+    def _create_code_key_tables(self, only: Optional[str] = None):
+        """Build the sorted code -> row id tables used for prefix lookups (for one table if `only` is given)"""
+        for table, (key_table, column) in CODE_KEY_TABLES.items():
+            if only not in (None, table) or not self.db.is_table_indexed(table) or self.db.is_table_indexed(key_table):
+                continue
+            try:
+                self.db.conn.execute(f"""
+                    CREATE TABLE {key_table} AS
+                    SELECT {column}, rowid AS row_id FROM {table}
+                    WHERE {column} IS NOT NULL
+                    ORDER BY {column}
+                """)
+                self.db.clear_caches()
+                logger.info(f"Built {key_table}")
+            except Exception as e:
+                logger.error(f"Error building {key_table}: {e}")
+
 
 class CAGEService:
     """Service for CAGE (Contractor) data queries"""
 
+    # Columns returned by list queries; get_by_code returns the full record
+    DISPLAY_COLUMNS = ("CAGE_CODE", "CAGE_STATUS", "TYPE", "CAO", "COMPANY",
+                       "CITY", "STATE_PROVINCE", "ZIP_POSTAL_ZONE", "COUNTRY")
+
     def __init__(self):
         self.db = get_db()
 
     def get_by_code(self, cage_code: str) -> Optional[Dict[str, Any]]:
         """Get CAGE record by code"""
-        results = self.db.query(
-            "SELECT * FROM P_CAGE WHERE CAGE_CODE = ? LIMIT 1",
+        results = self.db.query_cached(
+            f"SELECT {self.db.select_list('P_CAGE')} FROM P_CAGE WHERE CAGE_CODE = ? LIMIT 1",
             [cage_code.upper()]
         )
         return results[0] if results else None
 
-    def search(self, query: str, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> List[Dict[str, Any]]:
-        """Search CAGE records by company name, city, or code"""
-        search_term = f"%{query.upper()}%"
-        return self.db.query(f"""
-            SELECT * FROM P_CAGE
-            WHERE UPPER(COMPANY) LIKE ?
-               OR UPPER(CITY) LIKE ?
-               OR CAGE_CODE LIKE ?
+    def get_by_code_prefix(self, prefix: str, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Get CAGE records whose code starts with a partial code"""
+        prefix = prefix.strip().upper()
+        if not prefix:
+            return []
+        return _code_prefix_query(self.db, "P_CAGE", prefix, limit, self.DISPLAY_COLUMNS)
+
+    def search(self, query: str, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0,
+               prefix_only: bool = False, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search CAGE records by company name, city, or code
+
+        Text queries are ranked through the full-text index when it exists.
+        Otherwise LIKE is used, and with prefix_only only rows with a word
+        sharing the query's prefix are scanned (see _prefix_filter).
+        `state` restricts results to one STATE_PROVINCE before the limit.
+        """
+        state_sql, state_params = "", []
+        if state:
+            state_sql = f" AND {self.db.upper_column('P_CAGE', 'STATE_PROVINCE')} = ?"
+            state_params = [state.strip().upper()]
+
+        if _use_fts(self.db, "P_CAGE", query):
+            return self.db.query_search(
+                _fts_select(self.db, "P_CAGE", state_sql, self.DISPLAY_COLUMNS) + "LIMIT ? OFFSET ?",
+                [query.strip(), *state_params, limit, offset]
+            )
+
+        search_term = _like_term(query)
+        prefix_sql, prefix_params = _prefix_filter(self.db, "P_CAGE", query) if prefix_only else ("", [])
+        company = self.db.upper_column("P_CAGE", "COMPANY")
+        city = self.db.upper_column("P_CAGE", "CITY")
+        # One scan with an OR: DuckDB's indexes do not serve LIKE, so splitting
+        # this into per-column UNION ALL legs only adds scans and a dedup step
+        return self.db.query_search(f"""
+            SELECT {self.db.select_list("P_CAGE", self.DISPLAY_COLUMNS)} FROM P_CAGE
+            WHERE ({company} LIKE ?
+               OR {city} LIKE ?
+               OR CAGE_CODE LIKE ?){prefix_sql}{state_sql}
             ORDER BY COMPANY
             LIMIT ? OFFSET ?
-        """, [search_term, search_term, search_term, limit, offset])
+        """, [search_term, search_term, search_term, *prefix_params, *state_params, limit, offset])
 
     def search_by_location(self, state: Optional[str] = None,
                            city: Optional[str] = None,
@@ -93,14 +401,14 @@ class CAGEService:
         params = []
 
         if state:
-            conditions.append("UPPER(STATE_PROVINCE) = ?")
-            params.append(state.upper())
+            conditions.append(f"{self.db.upper_column('P_CAGE', 'STATE_PROVINCE')} = ?")
+            params.append(state.strip().upper())
         if city:
-            conditions.append("UPPER(CITY) LIKE ?")
-            params.append(f"%{city.upper()}%")
+            conditions.append(f"{self.db.upper_column('P_CAGE', 'CITY')} LIKE ?")
+            params.append(_like_term(city))
         if country:
-            conditions.append("UPPER(COUNTRY) LIKE ?")
-            params.append(f"%{country.upper()}%")
+            conditions.append(f"{self.db.upper_column('P_CAGE', 'COUNTRY')} LIKE ?")
+            params.append(_like_term(country))
 
         if not conditions:
             return []
@@ -108,24 +416,28 @@ class CAGEService:
         where_clause = " AND ".join(conditions)
         params.append(limit)
 
-        return self.db.query(f"""
-            SELECT * FROM P_CAGE
+        return self.db.query_search(f"""
+            SELECT {self.db.select_list("P_CAGE", self.DISPLAY_COLUMNS)} FROM P_CAGE
             WHERE {where_clause}
             ORDER BY COMPANY
             LIMIT ?
         """, params)
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get CAGE statistics"""
+        """Get CAGE statistics
+
+        The aggregates only change on re-index, so they are cached with the
+        reference lookups instead of re-scanning P_CAGE on every view.
+        """
         try:
-            total = self.db.query("SELECT COUNT(*) as count FROM P_CAGE")[0]["count"]
-            by_status = self.db.query("""
+            total = self.db.query_cached("SELECT COUNT(*) as count FROM P_CAGE")[0]["count"]
+            by_status = self.db.query_cached("""
                 SELECT CAGE_STATUS, COUNT(*) as count
                 FROM P_CAGE
                 GROUP BY CAGE_STATUS
                 ORDER BY count DESC
             """)
-            by_country = self.db.query("""
+            by_country = self.db.query_cached("""
                 SELECT COUNTRY, COUNT(*) as count
                 FROM P_CAGE
                 GROUP BY COUNTRY
@@ -152,33 +464,50 @@ class FSCService:
         """Get all Federal Supply Groups"""
         # FSG table uses FSC column but contains 4-digit FSC codes with FSG_TITLE
         # Get unique FSG (first 2 digits) with titles
-        return self.db.query("""
+        return self.db.query_cached("""
             SELECT DISTINCT
-                CAST(FSC / 100 AS INTEGER) as FSG,
+                FSC // 100 as FSG,
                 FSG_TITLE
             FROM V_H2_FSG
             ORDER BY FSG
         """)
 
+    def search_fsg(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Find FSGs by code prefix (digits) or title text, for filtering the FSG picker"""
+        query = query.strip()
+        if DIGITS_RE.fullmatch(query):
+            where, params = "CAST(FSC // 100 AS VARCHAR) LIKE ?", [f"{query}%"]
+        else:
+            where, params = f"{self.db.upper_column('V_H2_FSG', 'FSG_TITLE')} LIKE ?", [_like_term(query)]
+        return self.db.query_search(f"""
+            SELECT DISTINCT
+                FSC // 100 as FSG,
+                FSG_TITLE
+            FROM V_H2_FSG
+            WHERE {where}
+            ORDER BY FSG
+            LIMIT ?
+        """, [*params, limit])
+
     def get_all_fsc(self) -> List[Dict[str, Any]]:
         """Get all Federal Supply Classes"""
-        return self.db.query("""
-            SELECT * FROM V_H2_FSC
+        return self.db.query_cached(f"""
+            SELECT {self.db.select_list("V_H2_FSC")} FROM V_H2_FSC
             ORDER BY FSC
         """)
 
     def get_fsc_by_code(self, fsc: str) -> Optional[Dict[str, Any]]:
         """Get FSC details by code"""
+        columns = self.db.select_list("V_H2_FSC")
         # Handle both numeric and string FSC codes
-        try:
-            fsc_int = int(fsc)
-            results = self.db.query(
-                "SELECT * FROM V_H2_FSC WHERE FSC = ? LIMIT 1",
-                [fsc_int]
+        if DIGITS_RE.fullmatch(fsc.strip()):
+            results = self.db.query_cached(
+                f"SELECT {columns} FROM V_H2_FSC WHERE FSC = ? LIMIT 1",
+                [int(fsc)]
             )
-        except ValueError:
-            results = self.db.query(
-                "SELECT * FROM V_H2_FSC WHERE CAST(FSC AS VARCHAR) = ? LIMIT 1",
+        else:
+            results = self.db.query_prepared(
+                f"SELECT {columns} FROM V_H2_FSC WHERE CAST(FSC AS VARCHAR) = ? LIMIT 1",
                 [fsc]
             )
         return results[0] if results else None
@@ -186,41 +515,49 @@ class FSCService:
     def get_fsc_by_fsg(self, fsg: str) -> List[Dict[str, Any]]:
         """Get all FSCs within a FSG"""
         # FSG is first 2 digits of FSC
-        try:
-            fsg_int = int(fsg)
-            return self.db.query("""
-                SELECT * FROM V_H2_FSC
-                WHERE FSC >= ? AND FSC < ?
-                ORDER BY FSC
-            """, [fsg_int * 100, (fsg_int + 1) * 100])
-        except ValueError:
+        # The FSC browser passes FSG values straight from get_all_fsg (integers)
+        fsg = str(fsg).strip()
+        if not DIGITS_RE.fullmatch(fsg):
             return []
-
-    def search_fsc(self, query: str) -> List[Dict[str, Any]]:
-        """Search FSC by name or code"""
-        search_term = f"%{query.upper()}%"
+        fsg_int = int(fsg)
+        return self.db.query_prepared(f"""
+            SELECT {self.db.select_list("V_H2_FSC")} FROM V_H2_FSC
+            WHERE FSC >= ? AND FSC < ?
+            ORDER BY FSC
+        """, [fsg_int * 100, (fsg_int + 1) * 100])
+
+    def search_fsc(self, query: str, prefix_only: bool = False) -> List[Dict[str, Any]]:
+        """Search FSC by name or code (text queries ranked by full-text index when built)"""
+        search_term = _like_term(query)
+        prefix_sql, prefix_params = _prefix_filter(self.db, "V_H2_FSC", query) if prefix_only else ("", [])
+        columns = self.db.select_list("V_H2_FSC")
+        title = self.db.upper_column("V_H2_FSC", "FSC_TITLE")
         # Handle numeric FSC code search
-        try:
-            fsc_int = int(query)
-            return self.db.query("""
-                SELECT * FROM V_H2_FSC
-                WHERE FSC = ? OR UPPER(FSC_TITLE) LIKE ?
+        if DIGITS_RE.fullmatch(query.strip()):
+            return self.db.query_search(f"""
+                SELECT {columns} FROM V_H2_FSC
+                WHERE (FSC = ? OR {title} LIKE ?){prefix_sql}
                 ORDER BY FSC
                 LIMIT 100
-            """, [fsc_int, search_term])
-        except ValueError:
-            # Text search only
-            return self.db.query("""
-                SELECT * FROM V_H2_FSC
-                WHERE UPPER(FSC_TITLE) LIKE ?
-                ORDER BY FSC
-                LIMIT 100
-            """, [search_term])
+            """, [int(query), search_term, *prefix_params])
+
+        # Text search only
+        if _use_fts(self.db, "V_H2_FSC", query):
+            return self.db.query_search(_fts_select(self.db, "V_H2_FSC") + "LIMIT 100", [query.strip()])
+        return self.db.query_search(f"""
+            SELECT {columns} FROM V_H2_FSC
+            WHERE {title} LIKE ?{prefix_sql}
+            ORDER BY FSC
+            LIMIT 100
+        """, [search_term, *prefix_params])
 
 
 class NSNService:
     """Service for National Stock Number queries"""
 
+    # Columns returned by list queries; get_by_niin returns the full record
+    DISPLAY_COLUMNS = ("FSC", "NIIN", "ITEM_NAME", "INC")
+
     def __init__(self):
         self.db = get_db()
 
@@ -228,8 +565,8 @@ class NSNService:
         """Get NSN record by NIIN"""
         # P_FLIS_NSN has FSC, ITEM_NAME - use it first for useful info
         if self.db.is_table_indexed("P_FLIS_NSN"):
-            results = self.db.query(
-                "SELECT * FROM P_FLIS_NSN WHERE NIIN = ? LIMIT 1",
+            results = self.db.query_cached(
+                f"SELECT {self.db.select_list('P_FLIS_NSN')} FROM P_FLIS_NSN WHERE NIIN = ? LIMIT 1",
                 [niin]
             )
             if results:
@@ -237,7 +574,7 @@ class NSNService:
 
         # Fallback to FLISV (has characteristics data but no ITEM_NAME)
         if self.db.is_table_indexed("FLISV"):
-            results = self.db.query(
+            results = self.db.query_cached(
                 "SELECT * FROM FLISV WHERE NIIN = ? LIMIT 1",
                 [niin]
             )
@@ -246,6 +583,13 @@ class NSNService:
 
         return None
 
+    def get_by_niin_prefix(self, prefix: str, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Get NSN records whose NIIN starts with a partial NIIN"""
+        prefix = prefix.strip()
+        if not prefix or not self.db.is_table_indexed("P_FLIS_NSN"):
+            return []
+        return _code_prefix_query(self.db, "P_FLIS_NSN", prefix, limit, self.DISPLAY_COLUMNS)
+
     def search(self, query: str, fsc: Optional[str] = None,
                limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> List[Dict[str, Any]]:
         """Search NSN records"""
@@ -255,61 +599,91 @@ class NSNService:
             logger.warning("P_FLIS_NSN table not indexed - cannot search")
             return []
 
+        return self.db.query_search(*self.search_sql(query, fsc=fsc, limit=limit, offset=offset))
+
+    def search_sql(self, query: str, fsc: Optional[str] = None,
+                   limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> Tuple[str, List[Any]]:
+        """Build the (sql, params) for an NSN search without running it"""
         conditions = []
         params = []
 
-        # Text search - search by NIIN or ITEM_NAME
-        if query:
-            search_term = f"%{query.upper()}%"
-            conditions.append("(NIIN LIKE ? OR UPPER(ITEM_NAME) LIKE ?)")
-            params.extend([search_term, search_term])
-
         # FSC filter
         if fsc:
-            try:
-                fsc_int = int(fsc)
+            if DIGITS_RE.fullmatch(fsc.strip()):
                 conditions.append("FSC = ?")
-                params.append(fsc_int)
-            except ValueError:
+                params.append(int(fsc))
+            else:
                 conditions.append("CAST(FSC AS VARCHAR) = ?")
                 params.append(fsc)
 
+        # Ranked full-text search on item names when available
+        if query and _use_fts(self.db, "P_FLIS_NSN", query):
+            where = "".join(f" AND {c}" for c in conditions)
+            return (_fts_select(self.db, "P_FLIS_NSN", where, self.DISPLAY_COLUMNS) + "LIMIT ? OFFSET ?",
+                    [query.strip(), *params, limit, offset])
+
+        # Text search - search by NIIN or ITEM_NAME. DuckDB evaluates these
+        # filters before fetching the other selected columns, so a separate
+        # "match row ids first, then fetch" pass gains nothing here.
+        if query:
+            search_term = _like_term(query)
+            item_name = self.db.upper_column("P_FLIS_NSN", "ITEM_NAME")
+            conditions.insert(0, f"(NIIN LIKE ? OR {item_name} LIKE ?)")
+            params[:0] = [search_term, search_term]
+
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         params.extend([limit, offset])
 
-        return self.db.query(f"""
-            SELECT * FROM P_FLIS_NSN
+        return f"""
+            SELECT {self.db.select_list("P_FLIS_NSN", self.DISPLAY_COLUMNS)} FROM P_FLIS_NSN
             WHERE {where_clause}
             LIMIT ? OFFSET ?
-        """, params)
+        """, params
 
     def get_by_fsc(self, fsc: str, limit: int = DEFAULT_PAGE_SIZE,
                    offset: int = 0) -> List[Dict[str, Any]]:
         """Get NSN records by FSC"""
         # P_FLIS_NSN has FSC column, FLISV does not - prioritize P_FLIS_NSN for FSC queries
         if self.db.is_table_indexed("P_FLIS_NSN"):
-            try:
-                fsc_int = int(fsc)
-                return self.db.query("""
-                    SELECT * FROM P_FLIS_NSN
+            columns = self.db.select_list("P_FLIS_NSN", self.DISPLAY_COLUMNS)
+            if DIGITS_RE.fullmatch(fsc.strip()):
+                return self.db.query_search(f"""
+                    SELECT {columns} FROM P_FLIS_NSN
                     WHERE FSC = ?
                     LIMIT ? OFFSET ?
-                """, [fsc_int, limit, offset])
-            except ValueError:
-                return self.db.query("""
-                    SELECT * FROM P_FLIS_NSN
+                """, [int(fsc), limit, offset])
+            else:
+                return self.db.query_search(f"""
+                    SELECT {columns} FROM P_FLIS_NSN
                     WHERE CAST(FSC AS VARCHAR) = ?
                     LIMIT ? OFFSET ?
                 """, [fsc, limit, offset])
 
         return []
 
+    def get_full_detail(self, niin: str) -> Dict[str, Any]:
+        """Get the record, management data and characteristics for a NIIN
+
+        Three cached point lookups rather than one join: joining management
+        to characteristics would multiply their rows, and packing both into
+        list subqueries measured slower than the separate index lookups.
+        An unknown NIIN returns after the first lookup, with empty lists.
+        """
+        basic = self.get_by_niin(niin)
+        if basic is None:
+            return {"basic": None, "management": [], "characteristics": []}
+        return {
+            "basic": basic,
+            "management": self.get_management_data(niin),
+            "characteristics": self.get_characteristics(niin),
+        }
+
     def get_management_data(self, niin: str) -> List[Dict[str, Any]]:
         """Get management data for a NIIN"""
         if not self.db.is_table_indexed("V_FLIS_MANAGEMENT"):
             return []
 
-        return self.db.query("""
+        return self.db.query_cached("""
             SELECT * FROM V_FLIS_MANAGEMENT
             WHERE NIIN = ?
         """, [niin])
@@ -319,7 +693,7 @@ class NSNService:
         if not self.db.is_table_indexed("V_CHARACTERISTICS"):
             return []
 
-        return self.db.query("""
+        return self.db.query_cached("""
             SELECT * FROM V_CHARACTERISTICS
             WHERE NIIN = ?
         """, [niin])
@@ -328,79 +702,179 @@ class NSNService:
 class ItemNameService:
     """Service for Item Name (INC) queries"""
 
+    # Columns returned by list queries; get_by_inc returns the full record
+    DISPLAY_COLUMNS = ("INC", "FIIG_TITLE", "DEFINITION", "INC_STATUS", "FIIG",
+                       "CONCEPT_NO", "TYPE_CODE", "DT_ESTB_CANC")
+
     def __init__(self):
         self.db = get_db()
 
     def get_by_inc(self, inc: str) -> Optional[Dict[str, Any]]:
         """Get item name by INC code"""
-        results = self.db.query(
-            "SELECT * FROM V_H6_NAME_INC WHERE INC = ? LIMIT 1",
+        results = self.db.query_cached(
+            f"SELECT {self.db.select_list('V_H6_NAME_INC')} FROM V_H6_NAME_INC WHERE INC = ? LIMIT 1",
             [inc]
         )
         return results[0] if results else None
 
-    def search(self, query: str, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = DEFAULT_PAGE_SIZE,
+               prefix_only: bool = False) -> List[Dict[str, Any]]:
         """Search item names"""
-        search_term = f"%{query.upper()}%"
-        return self.db.query("""
-            SELECT * FROM V_H6_NAME_INC
-            WHERE UPPER(FIIG_TITLE) LIKE ?
-               OR UPPER(DEFINITION) LIKE ?
-               OR INC LIKE ?
+        if _use_fts(self.db, "V_H6_NAME_INC", query):
+            return self.db.query_search(
+                _fts_select(self.db, "V_H6_NAME_INC", display=self.DISPLAY_COLUMNS) + "LIMIT ?",
+                [query.strip(), limit]
+            )
+
+        search_term = _like_term(query)
+        prefix_sql, prefix_params = _prefix_filter(self.db, "V_H6_NAME_INC", query) if prefix_only else ("", [])
+        title = self.db.upper_column("V_H6_NAME_INC", "FIIG_TITLE")
+        definition = self.db.upper_column("V_H6_NAME_INC", "DEFINITION")
+        return self.db.query_search(f"""
+            SELECT {self.db.select_list("V_H6_NAME_INC", self.DISPLAY_COLUMNS)} FROM V_H6_NAME_INC
+            WHERE ({title} LIKE ?
+               OR {definition} LIKE ?
+               OR INC LIKE ?){prefix_sql}
             ORDER BY FIIG_TITLE
             LIMIT ?
-        """, [search_term, search_term, search_term, limit])
+        """, [search_term, search_term, search_term, *prefix_params, limit])
 
     def get_all(self, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get all item names (limited)"""
-        return self.db.query(f"""
-            SELECT * FROM V_H6_NAME_INC
+        return self.db.query_prepared(f"""
+            SELECT {self.db.select_list("V_H6_NAME_INC", self.DISPLAY_COLUMNS)} FROM V_H6_NAME_INC
             ORDER BY FIIG_TITLE
-            LIMIT {limit}
-        """)
+            LIMIT ?
+        """, [limit])
 
 
 class UnifiedSearchService:
     """Unified search across multiple data types"""
 
-    def __init__(self):
+    def __init__(self, cage_service: Optional[CAGEService] = None,
+                 fsc_service: Optional[FSCService] = None,
+                 nsn_service: Optional[NSNService] = None,
+                 item_name_service: Optional[ItemNameService] = None):
         self.db = get_db()
-        self.cage_service = CAGEService()
-        self.fsc_service = FSCService()
-        self.nsn_service = NSNService()
-        self.item_name_service = ItemNameService()
+        # Services passed in are shared; the rest are built on first use
+        services = {
+            "cage_service": cage_service,
+            "fsc_service": fsc_service,
+            "nsn_service": nsn_service,
+            "item_name_service": item_name_service,
+        }
+        for name, service in services.items():
+            if service is not None:
+                setattr(self, name, service)
+
+    @cached_property
+    def cage_service(self) -> CAGEService:
+        return CAGEService()
+
+    @cached_property
+    def fsc_service(self) -> FSCService:
+        return FSCService()
+
+    @cached_property
+    def nsn_service(self) -> NSNService:
+        return NSNService()
+
+    @cached_property
+    def item_name_service(self) -> ItemNameService:
+        return ItemNameService()
+
+    SEARCH_CATEGORIES = ("cage", "fsc", "nsn", "item_names")
+
+    # Shared by all instances: long-lived worker threads keep their DuckDB
+    # cursors (see PubLogDatabase._cursor) instead of opening four per search
+    _executor = ThreadPoolExecutor(max_workers=len(SEARCH_CATEGORIES),
+                                   thread_name_prefix="unified-search")
+
+    def _searches(self, query: str, limit: int,
+                  exact: bool = True) -> Dict[str, Callable[[], List[Dict[str, Any]]]]:
+        """Per-category search calls; each runs its own query and is independent
+
+        A query shaped like a NIIN, CAGE code or FSC code is answered by
+        exact lookups in the tables it can belong to, skipping the others
+        (unless exact=False). Otherwise CAGE, FSC and item-name searches are
+        shortlisted through the word prefix index, so they match words
+        starting with the query rather than arbitrary substrings.
+        """
+        code = query.strip().upper()
+        if exact and NIIN_RE.fullmatch(code):
+            return {"nsn": lambda: _as_list(self.nsn_service.get_by_niin(code))}
+        if exact and CAGE_RE.fullmatch(code):
+            searches = {"cage": lambda: _as_list(self.cage_service.get_by_code(code))}
+            if code.isdigit():
+                # INCs are 5-digit codes too
+                searches["item_names"] = lambda: _as_list(self.item_name_service.get_by_inc(code))
+            return searches
+        if exact and FSC_RE.fullmatch(code):
+            return {"fsc": lambda: _as_list(self.fsc_service.get_fsc_by_code(code))}
 
-    def search_all(self, query: str, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
-        """Search across all data types"""
-        results = {
-            "cage": [],
-            "fsc": [],
-            "nsn": [],
-            "item_names": []
+        return {
+            "cage": lambda: self.cage_service.search(query, limit=limit, prefix_only=True),
+            "fsc": lambda: self.fsc_service.search_fsc(query, prefix_only=True)[:limit],
+            "nsn": lambda: self.nsn_service.search(query, limit=limit),
+            "item_names": lambda: self.item_name_service.search(query, limit=limit, prefix_only=True),
         }
 
-        # Search CAGE
-        try:
-            results["cage"] = self.cage_service.search(query, limit=limit)
-        except Exception as e:
-            logger.error(f"CAGE search error: {e}")
+    @staticmethod
+    def _needs_text_search(query: str, results: Dict[str, List[Dict[str, Any]]]) -> bool:
+        """Whether a CAGE-shaped query found nothing by code and should be searched as text
 
-        # Search FSC
-        try:
-            results["fsc"] = self.fsc_service.search_fsc(query)[:limit]
-        except Exception as e:
-            logger.error(f"FSC search error: {e}")
+        Part numbers such as M16A2 have the shape of a CAGE code.
+        """
+        return CAGE_RE.fullmatch(query.strip().upper()) is not None and not any(results.values())
 
-        # Search NSN
+    @staticmethod
+    def _run_search(category: str, search: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run one category's search, logging failures as an empty result"""
         try:
-            results["nsn"] = self.nsn_service.search(query, limit=limit)
+            return search()
         except Exception as e:
-            logger.error(f"NSN search error: {e}")
+            logger.error(f"{category} search error: {e}")
+            return []
 
-        # Search Item Names
-        try:
-            results["item_names"] = self.item_name_service.search(query, limit=limit)
-        except Exception as e:
-            logger.error(f"Item name search error: {e}")
+    def _run_searches(self, searches: Dict[str, Callable[[], List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Run category searches concurrently on the shared executor"""
+        results = {category: [] for category in self.SEARCH_CATEGORIES}
+        futures = {
+            category: self._executor.submit(self._run_search, category, search)
+            for category, search in searches.items()
+        }
+        for category, future in futures.items():
+            results[category] = future.result()
+        return results
+
+    async def _run_searches_async(self, searches: Dict[str, Callable[[], List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Run category searches concurrently, each in a worker thread"""
+        found = await asyncio.gather(*(
+            asyncio.to_thread(self._run_search, category, search)
+            for category, search in searches.items()
+        ))
+        results = {category: [] for category in self.SEARCH_CATEGORIES}
+        results.update(zip(searches, found))
+        return results
+
+    def search_all(self, query: str, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Search across all data types, running the category queries concurrently
+
+        Synchronous counterpart of search_all_async for callers without an
+        event loop (the Streamlit pages).
+        """
+        results = self._run_searches(self._searches(query, limit))
+        if self._needs_text_search(query, results):
+            results = self._run_searches(self._searches(query, limit, exact=False))
+        return results
+
+    async def search_all_async(self, query: str, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Search across all data types, running the category queries concurrently
 
+        Each search runs in a worker thread on its own DuckDB cursor, so the
+        total latency is that of the slowest category rather than the sum.
+        """
+        results = await self._run_searches_async(self._searches(query, limit))
+        if self._needs_text_search(query, results):
+            results = await self._run_searches_async(self._searches(query, limit, exact=False))
         return results
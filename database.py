@@ -2,13 +2,27 @@
 Database connection and management for PubLog Application
 Uses DuckDB for fast analytical queries on large CSV files
 """
+import asyncio
+import csv
 import duckdb
+import hashlib
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Callable
 import logging
 
-from config import DB_PATH, DATA_FILES, PRIORITY_TABLES, LARGE_TABLES
+from cache import TTLCache
+from config import (
+    DB_PATH, DB_READ_ONLY, DUCKDB_THREADS, DUCKDB_MEMORY_LIMIT, DUCKDB_TEMP_DIRECTORY, INDEX_WORKERS,
+    PARQUET_CACHE_DIR, TABLE_PATHS, PRIORITY_TABLES, LARGE_TABLES,
+    STATS_CACHE_TTL, LOOKUP_CACHE_SIZE, LOOKUP_CACHE_TTL, SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL,
+    PREFIX_INDEX_TABLE, PREFIX_INDEX_SOURCES, CODE_KEY_TABLES, FTS_INDEXES, TABLE_COLUMN_TYPES, TABLE_SORT_KEYS,
+    NORMALIZED_COLUMNS, NORMALIZED_SUFFIX
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,6 +33,16 @@ class PubLogDatabase:
 
     _instance: Optional['PubLogDatabase'] = None
     _connection: Optional[duckdb.DuckDBPyConnection] = None
+    _stats_cache = TTLCache(maxsize=2, ttl=STATS_CACHE_TTL)
+    _columns_cache = TTLCache(maxsize=256, ttl=STATS_CACHE_TTL)
+    _tables_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL)
+    _fts_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL)
+    _lookup_cache = TTLCache(maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL)
+    _search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+    _load_lock = threading.Lock()
+    _active_loads = 0
+    _load_cursors: Dict[str, duckdb.DuckDBPyConnection] = {}
+    _statements: Dict[str, duckdb.Statement] = {}
 
     def __new__(cls):
         if cls._instance is None:
@@ -27,44 +51,86 @@ class PubLogDatabase:
 
     def __init__(self):
         if self._connection is None:
-            self._connection = duckdb.connect(str(DB_PATH))
+            self._connection = duckdb.connect(str(DB_PATH), read_only=DB_READ_ONLY)
+            self._local = threading.local()
+            self._configure()
             self._setup_extensions()
 
+    def _configure(self):
+        """Apply DuckDB resource settings from config"""
+        settings = {
+            "threads": DUCKDB_THREADS,
+            "memory_limit": DUCKDB_MEMORY_LIMIT,
+            "temp_directory": DUCKDB_TEMP_DIRECTORY,
+        }
+        for name, value in settings.items():
+            if value is None:
+                continue
+            try:
+                self._connection.execute(f"SET {name} = '{value}'")
+            except Exception as e:
+                logger.warning(f"Could not set DuckDB {name}={value}: {e}")
+
     def _setup_extensions(self):
         """Setup DuckDB extensions for better CSV handling"""
         try:
             self._connection.execute("INSTALL httpfs; LOAD httpfs;")
         except:
             pass  # Extension might already be installed
+        try:
+            self._connection.execute("INSTALL fts; LOAD fts;")
+        except Exception as e:
+            logger.warning(f"Full-text search extension unavailable, using LIKE search: {e}")
 
     @property
     def conn(self) -> duckdb.DuckDBPyConnection:
         return self._connection
 
+    def _cursor(self, conn: Optional[duckdb.DuckDBPyConnection] = None) -> duckdb.DuckDBPyConnection:
+        """Use a caller-supplied (pooled) cursor if given, else this thread's cursor
+
+        Results live on the connection object, so threads must not share
+        one for reads: a second execute() would replace the first's result.
+        Each thread keeps one cursor for reuse instead of opening a new one
+        per query; callers fetch results before running another query.
+        """
+        if conn is not None:
+            return conn
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self._connection.cursor()
+        return cursor
+
     def get_all_data_files(self) -> Dict[str, Path]:
         """Get flat dictionary of all data files"""
-        all_files = {}
-        for category, files in DATA_FILES.items():
-            all_files.update(files)
-        return all_files
+        return dict(TABLE_PATHS)
 
     def is_table_indexed(self, table_name: str) -> bool:
-        """Check if a table is already indexed in DuckDB"""
+        """Check if a table is already indexed in DuckDB
+
+        Answered from a cached set of table names, so the per-request guards
+        in the services do not query information_schema each time. Tables
+        outside schema main are named schema.table.
+        """
         try:
-            # DuckDB stores table names - check both upper and lower case
-            result = self._connection.execute(
-                "SELECT COUNT(*) FROM information_schema.tables WHERE UPPER(table_name) = UPPER(?)",
-                [table_name]
-            ).fetchone()
-            return result[0] > 0
+            table_names = self._tables_cache.get("tables")
+            if table_names is None:
+                # DuckDB stores table names - compare case-insensitively
+                table_names = frozenset(row[0] for row in self._cursor().execute("""
+                    SELECT DISTINCT UPPER(CASE WHEN table_schema = 'main' THEN table_name
+                                               ELSE table_schema || '.' || table_name END)
+                    FROM information_schema.tables
+                """).fetchall())
+                self._tables_cache.set("tables", table_names)
+            return table_name.upper() in table_names
         except Exception as e:
             logger.error(f"Error checking table {table_name}: {e}")
             return False
 
-    def get_indexed_tables(self) -> List[str]:
+    def get_indexed_tables(self, conn: Optional[duckdb.DuckDBPyConnection] = None) -> List[str]:
         """Get list of all indexed tables"""
         try:
-            result = self._connection.execute(
+            result = self._cursor(conn).execute(
                 "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'"
             ).fetchall()
             return [row[0] for row in result]
@@ -74,6 +140,10 @@ class PubLogDatabase:
 
     def index_csv_file(self, table_name: str, file_path: Path, force: bool = False) -> bool:
         """Index a CSV file into DuckDB"""
+        if DB_READ_ONLY:
+            logger.warning(f"Database opened read-only (PUBLOG_DB_READONLY), not indexing {table_name}")
+            return False
+
         if not file_path.exists():
             logger.warning(f"File not found: {file_path}")
             return False
@@ -82,99 +152,356 @@ class PubLogDatabase:
             logger.info(f"Table {table_name} already indexed, skipping")
             return True
 
+        # One transaction per table on its own cursor, so loads can run in
+        # parallel and a failed re-index keeps the old table
+        cursor = self._connection.cursor()
         try:
-            # Drop existing table if force
-            if force:
-                self._connection.execute(f"DROP TABLE IF EXISTS {table_name}")
-
-            # Get file size for logging
-            file_size_mb = file_path.stat().st_size / (1024 * 1024)
-            logger.info(f"Indexing {table_name} ({file_size_mb:.1f} MB)...")
-
-            # Create table from CSV
-            self._connection.execute(f"""
-                CREATE TABLE {table_name} AS
-                SELECT * FROM read_csv_auto('{file_path}',
-                    header=true,
-                    quote='"',
-                    escape='"',
-                    ignore_errors=true,
-                    sample_size=10000
-                )
+            # Track (without printing) progress so load_progress() can report it
+            cursor.execute("SET enable_progress_bar = true")
+            cursor.execute("SET enable_progress_bar_print = false")
+            self._load_cursors[table_name] = cursor
+            with self._bulk_loading():
+                cursor.begin()
+                try:
+                    # Drop existing table if force
+                    if force:
+                        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+                    # Get file size for logging
+                    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+                    logger.info(f"Indexing {table_name} ({file_size_mb:.1f} MB)...")
+
+                    # Create table from CSV (or its Parquet copy); the statement
+                    # returns the inserted row count
+                    # The Parquet copy is written from the sorted table and its row
+                    # groups load as contiguous runs, so only CSV loads need the ORDER BY.
+                    # A forced re-index always reparses the CSV and rewrites the copy.
+                    parquet_path = None if force else self._parquet_copy(table_name, file_path)
+                    if parquet_path:
+                        source = f"read_parquet('{parquet_path}')"
+                    else:
+                        header = self._csv_header(file_path)
+                        types = {col: t for col, t in TABLE_COLUMN_TYPES.get(table_name, {}).items()
+                                 if col in header}
+                        sort_keys = [col for col in TABLE_SORT_KEYS.get(table_name, []) if col in header]
+                        source = f"""read_csv_auto('{file_path}',
+                            header=true,
+                            quote='"',
+                            escape='"',
+                            ignore_errors=true,
+                            sample_size=10000{f", types={types}" if types else ""}
+                        ){f" ORDER BY {', '.join(sort_keys)}" if sort_keys else ""}"""
+                    count = cursor.execute(
+                        f"CREATE TABLE {table_name} AS SELECT * FROM {source}"
+                    ).fetchone()[0]
+                    cursor.commit()
+                    logger.info(f"Indexed {table_name}: {count:,} rows"
+                                + (" from Parquet copy" if parquet_path else ""))
+                except Exception as e:
+                    cursor.rollback()
+                    logger.error(f"Error indexing {table_name}: {e}")
+                    return False
+
+            if not parquet_path:
+                self.materialize_parquet(table_name, file_path, cursor)
+
+            # Row ids changed, so derived search indexes are stale until rebuilt.
+            # Serialized: concurrent loads may both drop the shared prefix index.
+            with self._load_lock:
+                try:
+                    if table_name in PREFIX_INDEX_SOURCES:
+                        cursor.execute(f"DROP TABLE IF EXISTS {PREFIX_INDEX_TABLE}")
+                    if table_name in CODE_KEY_TABLES:
+                        cursor.execute(f"DROP TABLE IF EXISTS {CODE_KEY_TABLES[table_name][0]}")
+                    if table_name in FTS_INDEXES and self.has_fts_index(table_name):
+                        cursor.execute(f"PRAGMA drop_fts_index('{table_name}')")
+                except Exception as e:
+                    logger.warning(f"Could not drop search indexes for {table_name}: {e}")
+        finally:
+            self._load_cursors.pop(table_name, None)
+            cursor.close()
+
+        self.clear_caches()
+        self.add_normalized_columns(table_name)
+        return True
+
+    def load_progress(self, table_name: str) -> Optional[float]:
+        """Percent complete of the statement running in a table's load
+
+        None when the table is not loading or DuckDB has no estimate yet.
+        A load runs several statements (table, then its Parquet copy), each
+        reporting from 0 to 100.
+        """
+        cursor = self._load_cursors.get(table_name)
+        if cursor is None:
+            return None
+        try:
+            progress = cursor.query_progress()
+        except Exception:
+            return None
+        return progress if progress >= 0 else None
+
+    def _csv_header(self, csv_path: Path) -> List[str]:
+        """Column names from a CSV's header line
+
+        Used to filter TABLE_COLUMN_TYPES and TABLE_SORT_KEYS to columns the
+        file has; read_csv rejects type overrides for missing columns.
+        """
+        # utf-8-sig drops a byte order mark that would stick to the first name
+        with open(csv_path, newline="", encoding="utf-8-sig", errors="replace") as f:
+            return [name.strip() for name in next(csv.reader(f), [])]
+
+    def _parquet_path(self, table_name: str) -> Path:
+        """Where a table's Parquet copy lives for the current load options
+
+        The name carries a hash of the table's TABLE_COLUMN_TYPES and
+        TABLE_SORT_KEYS, so changing either stops an older copy from being
+        reused.
+        """
+        options = json.dumps([TABLE_COLUMN_TYPES.get(table_name, {}),
+                              TABLE_SORT_KEYS.get(table_name, [])], sort_keys=True)
+        key = hashlib.sha1(options.encode()).hexdigest()[:12]
+        return PARQUET_CACHE_DIR / f"{table_name}.{key}.parquet"
+
+    def _parquet_copy(self, table_name: str, csv_path: Path) -> Optional[Path]:
+        """Path of a table's Parquet copy if it exists and is newer than the CSV"""
+        if PARQUET_CACHE_DIR is None:
+            return None
+        parquet_path = self._parquet_path(table_name)
+        if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            return parquet_path
+        return None
+
+    def materialize_parquet(self, table_name: str, csv_path: Path,
+                            conn: Optional[duckdb.DuckDBPyConnection] = None) -> bool:
+        """Write a freshly loaded table to Parquet so later re-indexing skips CSV parsing"""
+        if PARQUET_CACHE_DIR is None:
+            return False
+        parquet_path = self._parquet_path(table_name)
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        try:
+            PARQUET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._cursor(conn).execute(f"""
+                COPY {table_name} TO '{tmp_path}'
+                (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 100000)
             """)
-
-            # Get row count
-            count = self._connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-            logger.info(f"Indexed {table_name}: {count:,} rows")
-
+            # Rename so a half-written file is never picked up
+            os.replace(tmp_path, parquet_path)
+            # Copies written under other load options are never read again
+            for stale in [PARQUET_CACHE_DIR / f"{table_name}.parquet",
+                          *PARQUET_CACHE_DIR.glob(f"{table_name}.*.parquet")]:
+                if stale != parquet_path:
+                    stale.unlink(missing_ok=True)
             return True
         except Exception as e:
-            logger.error(f"Error indexing {table_name}: {e}")
+            logger.warning(f"Could not write Parquet copy of {table_name}: {e}")
+            tmp_path.unlink(missing_ok=True)
             return False
 
+    @contextmanager
+    def _bulk_loading(self):
+        """Disable preserve_insertion_order while any CSV load is running
+
+        The setting is database-wide, so it is only reset by the last
+        concurrent load to finish. Row order is irrelevant when loading and
+        not tracking it saves memory.
+        """
+        with self._load_lock:
+            if PubLogDatabase._active_loads == 0:
+                self._connection.cursor().execute("SET preserve_insertion_order = false")
+            PubLogDatabase._active_loads += 1
+        try:
+            yield
+        finally:
+            with self._load_lock:
+                PubLogDatabase._active_loads -= 1
+                if PubLogDatabase._active_loads == 0:
+                    self._connection.cursor().execute("RESET preserve_insertion_order")
+
     def create_indexes(self, table_name: str, columns: List[str]):
-        """Create indexes on specific columns for faster lookups"""
-        for col in columns:
+        """Create indexes on specific columns for faster lookups
+
+        All statements go to DuckDB as one script; if any fails, each index
+        is retried on its own so the valid ones are still built.
+        """
+        index_names = {col: f"idx_{table_name}_{col}".replace(".", "_").lower() for col in columns}
+        statements = {
+            col: f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({col})"
+            for col, index_name in index_names.items()
+        }
+        try:
+            self._connection.execute(";\n".join(statements.values()))
+            logger.info(f"Created indexes on {table_name}: {', '.join(columns)}")
+            return
+        except Exception:
+            pass
+
+        for col, statement in statements.items():
             try:
-                index_name = f"idx_{table_name}_{col}".lower()
-                self._connection.execute(
-                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({col})"
-                )
-                logger.info(f"Created index {index_name}")
+                self._connection.execute(statement)
+                logger.info(f"Created index {index_names[col]}")
             except Exception as e:
                 logger.warning(f"Could not create index on {table_name}.{col}: {e}")
 
-    def index_priority_tables(self, force: bool = False) -> Dict[str, bool]:
-        """Index priority (smaller) tables first"""
-        results = {}
-        all_files = self.get_all_data_files()
+    def drop_indexes(self, table_name: str, columns: List[str]):
+        """Drop indexes that create_indexes built on these columns, if present"""
+        for col in columns:
+            index_name = f"idx_{table_name}_{col}".replace(".", "_").lower()
+            try:
+                self._connection.execute(f"DROP INDEX IF EXISTS {index_name}")
+            except Exception as e:
+                logger.warning(f"Could not drop index {index_name}: {e}")
+
+    def add_normalized_columns(self, table_name: str):
+        """Store uppercase <COL>_UC copies of a table's NORMALIZED_COLUMNS"""
+        existing = self.get_columns(table_name)
+        missing = [
+            col for col in NORMALIZED_COLUMNS.get(table_name, [])
+            if col in existing and f"{col}{NORMALIZED_SUFFIX}" not in existing
+        ]
+        if not missing:
+            return
 
-        for table_name in PRIORITY_TABLES:
-            if table_name in all_files:
-                results[table_name] = self.index_csv_file(
-                    table_name, all_files[table_name], force
+        try:
+            cursor = self._cursor()
+            for col in missing:
+                cursor.execute(
+                    f"ALTER TABLE {table_name} ADD COLUMN {col}{NORMALIZED_SUFFIX} VARCHAR"
                 )
+            assignments = ", ".join(f"{col}{NORMALIZED_SUFFIX} = UPPER({col})" for col in missing)
+            cursor.execute(f"UPDATE {table_name} SET {assignments}")
+            logger.info(f"Added normalized columns to {table_name}: {', '.join(missing)}")
+        except Exception as e:
+            logger.warning(f"Could not add normalized columns to {table_name}: {e}")
+        finally:
+            self._columns_cache.clear()
+
+    def get_columns(self, table_name: str) -> List[str]:
+        """Get a table's column names (cached; empty if the table is missing)"""
+        key = table_name.upper()
+        columns = self._columns_cache.get(key)
+        if columns is None:
+            columns = [row[0] for row in self._cursor().execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE UPPER(table_name) = ? AND table_schema = 'main' ORDER BY ordinal_position",
+                [key]
+            ).fetchall()]
+            self._columns_cache.set(key, columns)
+        return columns
+
+    def select_list(self, table_name: str, display: Optional[Sequence[str]] = None) -> str:
+        """SELECT list for a table's own columns, hiding derived *_UC copies
+
+        With `display`, only those columns are selected (the ones the table
+        actually has), so list views do not pull every column of wide tables.
+        """
+        columns = self.get_columns(table_name)
+        if display:
+            present = [col for col in display if col in columns]
+            if present:
+                return ", ".join(present)
+        hidden = [
+            f"{col}{NORMALIZED_SUFFIX}" for col in NORMALIZED_COLUMNS.get(table_name, [])
+            if f"{col}{NORMALIZED_SUFFIX}" in columns
+        ]
+        return f"* EXCLUDE ({', '.join(hidden)})" if hidden else "*"
+
+    def upper_column(self, table_name: str, column: str) -> str:
+        """SQL for a column's uppercase value, using its stored *_UC copy if present"""
+        normalized = f"{column}{NORMALIZED_SUFFIX}"
+        return normalized if normalized in self.get_columns(table_name) else f"UPPER({column})"
+
+    def create_fts_index(self, table_name: str, id_column: str, columns: List[str]) -> bool:
+        """Build a BM25 full-text index (schema fts_main_<table>) over text columns"""
+        try:
+            column_list = ", ".join(f"'{col}'" for col in columns)
+            # Keep digits in tokens so codes like NIINs stay searchable
+            self._connection.execute(f"""
+                PRAGMA create_fts_index('{table_name}', '{id_column}', {column_list},
+                    stemmer='porter', lower=1, ignore='(\\.|[^a-z0-9])+', overwrite=1)
+            """)
+            self._fts_cache.clear()
+            logger.info(f"Created full-text index on {table_name}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not create full-text index on {table_name}: {e}")
+            return False
 
-        return results
-
-    def index_large_tables(self, force: bool = False) -> Dict[str, bool]:
-        """Index large tables (may take longer)"""
-        results = {}
-        all_files = self.get_all_data_files()
+    def has_fts_index(self, table_name: str) -> bool:
+        """Check if a full-text index exists for a table
 
-        for table_name in LARGE_TABLES:
-            if table_name in all_files:
-                results[table_name] = self.index_csv_file(
-                    table_name, all_files[table_name], force
-                )
+        Every CAGE/FSC/INC/NSN search asks this, so the index schemas are
+        read once and cached like the table list (cleared by clear_caches).
+        """
+        try:
+            schemas = self._fts_cache.get("schemas")
+            if schemas is None:
+                schemas = frozenset(row[0] for row in self._cursor().execute(
+                    "SELECT schema_name FROM information_schema.schemata WHERE schema_name LIKE 'fts_main_%'"
+                ).fetchall())
+                self._fts_cache.set("schemas", schemas)
+            return f"fts_main_{table_name}" in schemas
+        except Exception as e:
+            logger.error(f"Error checking full-text index for {table_name}: {e}")
+            return False
 
-        return results
+    def index_tables(self, table_names: List[str], force: bool = False,
+                     on_table_done: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+        """Index several tables concurrently (up to INDEX_WORKERS at a time)
 
-    def index_all_tables(self, force: bool = False) -> Dict[str, bool]:
-        """Index all available tables"""
+        DuckDB releases the GIL while reading CSVs, so loads overlap. Tables
+        are submitted in the given order. on_table_done, if given, is called
+        with each table name and result as loads finish.
+        """
         results = {}
-        all_files = self.get_all_data_files()
-
-        # Index priority tables first
-        results.update(self.index_priority_tables(force))
-
-        # Then large tables
-        results.update(self.index_large_tables(force))
-
-        # Any remaining tables
-        for table_name, file_path in all_files.items():
-            if table_name not in results:
-                results[table_name] = self.index_csv_file(table_name, file_path, force)
-
-        return results
+        with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.index_csv_file, table_name, TABLE_PATHS[table_name], force): table_name
+                for table_name in table_names
+            }
+            for future in as_completed(futures):
+                table_name = futures[future]
+                try:
+                    results[table_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error indexing {table_name}: {e}")
+                    results[table_name] = False
+                if on_table_done:
+                    on_table_done(table_name, results[table_name])
+
+        # Report in submission order rather than completion order
+        return {table_name: results[table_name] for table_name in table_names}
+
+    def index_priority_tables(self, force: bool = False,
+                              on_table_done: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+        """Index priority (smaller) tables first"""
+        return self.index_tables(PRIORITY_TABLES, force, on_table_done)
 
-    def query(self, sql: str, params: Optional[List] = None) -> List[Dict[str, Any]]:
-        """Execute a query and return results as list of dicts"""
+    def index_large_tables(self, force: bool = False) -> Dict[str, bool]:
+        """Index large tables (may take longer)"""
+        return self.index_tables(LARGE_TABLES, force)
+
+    def index_all_tables(self, force: bool = False,
+                         on_table_done: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+        """Index all available tables: priority first, then large, then the rest"""
+        ordered = list(PRIORITY_TABLES) + list(LARGE_TABLES)
+        ordered += [table_name for table_name in TABLE_PATHS if table_name not in ordered]
+        return self.index_tables(ordered, force, on_table_done)
+
+    def query(self, sql: str, params: Optional[List] = None,
+              conn: Optional[duckdb.DuckDBPyConnection] = None) -> List[Dict[str, Any]]:
+        """Execute a query and return results as list of dicts
+
+        Rows, not Arrow tables: the API serializes them as JSON and the pages
+        read fields per row. Result sets are page-sized (at most 500 rows),
+        so building a DataFrame from them costs about 1 ms.
+        """
         try:
+            cursor = self._cursor(conn)
             if params:
-                result = self._connection.execute(sql, params)
+                result = cursor.execute(sql, params)
             else:
-                result = self._connection.execute(sql)
+                result = cursor.execute(sql)
 
             columns = [desc[0] for desc in result.description]
             rows = result.fetchall()
@@ -184,27 +511,129 @@ class PubLogDatabase:
             logger.error(f"Query error: {e}")
             raise
 
-    def query_df(self, sql: str, params: Optional[List] = None):
+    def query_prepared(self, sql: str, params: Optional[List] = None,
+                       conn: Optional[duckdb.DuckDBPyConnection] = None) -> List[Dict[str, Any]]:
+        """Like query(), but parses the SQL once and reuses it on later calls
+
+        For service queries: their SQL text is one of a fixed set of variants
+        and only the bound parameters change between calls.
+        Parsed statements are not tied to a connection, so they work with
+        any pooled cursor.
+        """
+        statement = self._statements.get(sql)
+        if statement is None:
+            statement = self._cursor(conn).extract_statements(sql)[0]
+            self._statements[sql] = statement
+        return self.query(statement, params, conn)
+
+    def query_cached(self, sql: str, params: Optional[List] = None) -> List[Dict[str, Any]]:
+        """Like query_prepared(), but results are cached until the next re-index
+
+        For point lookups and static reference lists that are read far more
+        often than the data changes. Callers get copies of the cached rows.
+        """
+        return self._query_through(self._lookup_cache, sql, params)
+
+    def query_search(self, sql: str, params: Optional[List] = None) -> List[Dict[str, Any]]:
+        """Like query_cached(), for search result pages
+
+        Users resubmit and page back through the same searches; the smaller
+        search cache keeps those repeats from re-running the scan without
+        letting large result pages crowd out the point lookups.
+        """
+        return self._query_through(self._search_cache, sql, params)
+
+    def _query_through(self, cache: TTLCache, sql: str, params: Optional[List]) -> List[Dict[str, Any]]:
+        """Serve (sql, params) from `cache`, running and storing it on a miss"""
+        key = (sql, tuple(params or ()))
+        rows = cache.get(key)
+        if rows is None:
+            rows = self.query_prepared(sql, params)
+            cache.set(key, rows)
+        return [dict(row) for row in rows]
+
+    def query_arrow(self, sql: str, params: Optional[List] = None,
+                    conn: Optional[duckdb.DuckDBPyConnection] = None):
+        """Execute a query and return results as a pyarrow Table
+
+        Columnar, with no per-row Python objects; for bulk consumers. Small
+        lookups are cheaper through query(), whose row fetch has less fixed
+        overhead than the Arrow conversion.
+        """
+        try:
+            result = self._cursor(conn).execute(sql, params or [])
+            # fetch_arrow_table() is deprecated in favour of to_arrow_table() since DuckDB 1.4
+            fetch = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+            return fetch()
+        except Exception as e:
+            logger.error(f"Query error: {e}")
+            raise
+
+    def prepare_select(self, sql: str, limit: int,
+                       conn: Optional[duckdb.DuckDBPyConnection] = None) -> str:
+        """Validate a user-supplied query and cap it with a LIMIT
+
+        Uses DuckDB's own parser: only a single SELECT statement is
+        accepted. LIMIT is appended when the top-level query has none (a
+        LIMIT inside a subquery or a string literal does not count); a query
+        with its own LIMIT is wrapped so at most `limit` rows come back.
+        Raises ValueError for anything else.
+        """
+        try:
+            statements = duckdb.extract_statements(sql)
+        except duckdb.Error as e:
+            raise ValueError(str(e)) from e
+
+        if len(statements) != 1:
+            raise ValueError("Exactly one statement is allowed")
+        statement = statements[0]
+        if statement.type != duckdb.StatementType.SELECT:
+            raise ValueError("Only SELECT queries are allowed")
+
+        tree = json.loads(self._cursor(conn).execute(
+            "SELECT json_serialize_sql(?)", [statement.query]
+        ).fetchone()[0])
+        if tree.get("error"):
+            raise ValueError(tree.get("error_message", "Could not parse query"))
+
+        # The statement text runs through its ';' and any comment after it,
+        # so cut at the last real token rather than stripping characters
+        query = statement.query
+        tokens = duckdb.tokenize(query)
+        while tokens and tokens[-1][1] == duckdb.token_type.operator and query[tokens[-1][0]] == ";":
+            query = query[:tokens.pop()[0]]
+        modifiers = tree["statements"][0]["node"].get("modifiers", [])
+        # Newlines so a trailing line comment cannot swallow the LIMIT
+        if any(m["type"] == "LIMIT_MODIFIER" for m in modifiers):
+            # Keeps the caller's LIMIT/OFFSET when smaller than ours
+            return f"SELECT * FROM (\n{query}\n) LIMIT {int(limit)}"
+        return f"{query}\nLIMIT {int(limit)}"
+
+    def query_df(self, sql: str, params: Optional[List] = None,
+                 conn: Optional[duckdb.DuckDBPyConnection] = None):
         """Execute a query and return results as DataFrame"""
         try:
+            cursor = self._cursor(conn)
             if params:
-                return self._connection.execute(sql, params).fetchdf()
+                return cursor.execute(sql, params).fetchdf()
             else:
-                return self._connection.execute(sql).fetchdf()
+                return cursor.execute(sql).fetchdf()
         except Exception as e:
             logger.error(f"Query error: {e}")
             raise
 
-    def get_table_info(self, table_name: str) -> Dict[str, Any]:
+    def get_table_info(self, table_name: str,
+                       conn: Optional[duckdb.DuckDBPyConnection] = None) -> Dict[str, Any]:
         """Get information about a table"""
+        cursor = self._cursor(conn)
         try:
             # Get column info
-            columns = self._connection.execute(
+            columns = cursor.execute(
                 f"DESCRIBE {table_name}"
             ).fetchall()
 
             # Get row count
-            count = self._connection.execute(
+            count = cursor.execute(
                 f"SELECT COUNT(*) FROM {table_name}"
             ).fetchone()[0]
 
@@ -220,37 +649,103 @@ class PubLogDatabase:
             logger.error(f"Error getting table info for {table_name}: {e}")
             return {}
 
-    def get_database_stats(self) -> Dict[str, Any]:
-        """Get overall database statistics"""
-        tables = self.get_indexed_tables()
-        total_rows = 0
+    def get_database_stats(self, conn: Optional[duckdb.DuckDBPyConnection] = None,
+                           precise: bool = False) -> Dict[str, Any]:
+        """Get overall database statistics (cached for STATS_CACHE_TTL seconds)
+
+        Row counts come from DuckDB's catalog (duckdb_tables().estimated_size)
+        in one query; precise=True runs an exact COUNT(*) per table instead.
+        """
+        cache_key = "precise" if precise else "estimated"
+        cached = self._stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        cursor = self._cursor(conn)
+        tables = self.get_indexed_tables(conn=cursor)
         table_stats = []
 
-        for table in tables:
+        if precise:
+            for table in tables:
+                try:
+                    count = cursor.execute(
+                        f"SELECT COUNT(*) FROM {table}"
+                    ).fetchone()[0]
+                    table_stats.append({"table": table, "rows": count})
+                except:
+                    pass
+        else:
             try:
-                count = self._connection.execute(
-                    f"SELECT COUNT(*) FROM {table}"
-                ).fetchone()[0]
-                total_rows += count
-                table_stats.append({"table": table, "rows": count})
-            except:
-                pass
-
-        return {
+                table_stats = [
+                    {"table": table, "rows": rows}
+                    for table, rows in cursor.execute("""
+                        SELECT table_name, estimated_size FROM duckdb_tables()
+                        WHERE database_name = current_database() AND schema_name = 'main'
+                    """).fetchall()
+                ]
+            except Exception as e:
+                logger.error(f"Error reading table sizes: {e}")
+
+        stats = {
             "total_tables": len(tables),
-            "total_rows": total_rows,
+            "total_rows": sum(t["rows"] for t in table_stats),
             "tables": sorted(table_stats, key=lambda x: x["rows"], reverse=True),
             "db_file_size_mb": DB_PATH.stat().st_size / (1024 * 1024) if DB_PATH.exists() else 0
         }
+        self._stats_cache.set(cache_key, stats)
+        return stats
+
+    def clear_stats_cache(self):
+        """Drop cached statistics and the table list so the next read recounts"""
+        self._stats_cache.clear()
+        self._tables_cache.clear()
+
+    def clear_caches(self):
+        """Drop cached metadata after the indexed data changes"""
+        self._stats_cache.clear()
+        self._columns_cache.clear()
+        self._tables_cache.clear()
+        self._fts_cache.clear()
+        self._lookup_cache.clear()
+        self._search_cache.clear()
+        self._statements.clear()
 
     def close(self):
         """Close database connection"""
         if self._connection:
             self._connection.close()
             self._connection = None
+            self._local = threading.local()
             PubLogDatabase._instance = None
 
 
+class DuckDBPool:
+    """Fixed-size pool of DuckDB cursors for concurrent request handling
+
+    Each cursor is an independent connection to the same database, so
+    requests holding different cursors can execute in parallel.
+    """
+
+    def __init__(self, db: PubLogDatabase, size: Optional[int] = None):
+        self.size = size or os.cpu_count() or 4
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.size)
+        for _ in range(self.size):
+            self._queue.put_nowait(db.conn.cursor())
+
+    async def acquire(self) -> duckdb.DuckDBPyConnection:
+        """Wait for a free cursor"""
+        return await self._queue.get()
+
+    def release(self, conn: duckdb.DuckDBPyConnection):
+        """Return a cursor to the pool"""
+        self._queue.put_nowait(conn)
+
+    def close(self):
+        """Close all idle cursors"""
+        while not self._queue.empty():
+            self._queue.get_nowait().close()
+
+
 # Singleton accessor
 def get_db() -> PubLogDatabase:
     return PubLogDatabase()
@@ -20,44 +20,49 @@ st.markdown("Search across all PubLog data: CAGE codes, NSN items, FSC classific
 # Initialize services
 @st.cache_resource
 def get_services():
+    cage, fsc, nsn, item_name = CAGEService(), FSCService(), NSNService(), ItemNameService()
     return {
-        "unified": UnifiedSearchService(),
-        "cage": CAGEService(),
-        "fsc": FSCService(),
-        "nsn": NSNService(),
-        "item_name": ItemNameService()
+        "unified": UnifiedSearchService(cage, fsc, nsn, item_name),
+        "cage": cage,
+        "fsc": fsc,
+        "nsn": nsn,
+        "item_name": item_name
     }
 
 services = get_services()
 
-# Search interface
-col1, col2 = st.columns([3, 1])
+# Search interface; as a form, widget edits apply together on submit (or Enter)
+# instead of each one re-running the search
+with st.form("search_form"):
+    col1, col2 = st.columns([3, 1])
 
-with col1:
-    search_query = st.text_input(
-        "Enter search term",
-        placeholder="Enter CAGE code, NSN/NIIN, company name, item name, or FSC...",
-        help="Search across all data types"
-    )
+    with col1:
+        search_query = st.text_input(
+            "Enter search term",
+            placeholder="Enter CAGE code, NSN/NIIN, company name, item name, or FSC...",
+            help="Search across all data types"
+        )
 
-with col2:
-    search_type = st.selectbox(
-        "Search type",
-        ["All", "CAGE Only", "NSN Only", "FSC Only", "Item Names Only"]
-    )
+    with col2:
+        search_type = st.selectbox(
+            "Search type",
+            ["All", "CAGE Only", "NSN Only", "FSC Only", "Item Names Only"]
+        )
 
-# Advanced filters
-with st.expander("Advanced Filters"):
-    col1, col2, col3 = st.columns(3)
+    # Advanced filters
+    with st.expander("Advanced Filters"):
+        col1, col2, col3 = st.columns(3)
 
-    with col1:
-        fsc_filter = st.text_input("Filter by FSC (4 digits)", max_chars=4)
+        with col1:
+            fsc_filter = st.text_input("Filter by FSC (4 digits)", max_chars=4)
 
-    with col2:
-        state_filter = st.text_input("Filter by State", max_chars=2)
+        with col2:
+            state_filter = st.text_input("Filter by State", max_chars=2)
+
+        with col3:
+            max_results = st.slider("Max results per category", 10, 100, 25)
 
-    with col3:
-        max_results = st.slider("Max results per category", 10, 100, 25)
+    st.form_submit_button("🔍 Search")
 
 # Perform search
 if search_query:
@@ -70,19 +75,19 @@ if search_query:
                 tabs = st.tabs(["📋 All Results", "🏢 CAGE", "📦 NSN", "📊 FSC", "📝 Item Names"])
 
                 with tabs[0]:
-                    total = sum(len(v) for v in results.values())
-                    st.metric("Total Results", total)
+                    counts = {category: len(rows) for category, rows in results.items()}
+                    st.metric("Total Results", sum(counts.values()))
 
                     # Summary of results
                     summary_cols = st.columns(4)
                     with summary_cols[0]:
-                        st.metric("CAGE Records", len(results.get("cage", [])))
+                        st.metric("CAGE Records", counts.get("cage", 0))
                     with summary_cols[1]:
-                        st.metric("NSN Items", len(results.get("nsn", [])))
+                        st.metric("NSN Items", counts.get("nsn", 0))
                     with summary_cols[2]:
-                        st.metric("FSC Codes", len(results.get("fsc", [])))
+                        st.metric("FSC Codes", counts.get("fsc", 0))
                     with summary_cols[3]:
-                        st.metric("Item Names", len(results.get("item_names", [])))
+                        st.metric("Item Names", counts.get("item_names", 0))
 
                 with tabs[1]:
                     if results.get("cage"):
@@ -113,9 +118,7 @@ if search_query:
                         st.info("No item names found")
 
             elif search_type == "CAGE Only":
-                results = services["cage"].search(search_query, limit=max_results)
-                if state_filter:
-                    results = [r for r in results if r.get("STATE_PROVINCE", "").upper() == state_filter.upper()]
+                results = services["cage"].search(search_query, limit=max_results, state=state_filter or None)
 
                 st.subheader(f"CAGE Results ({len(results)})")
                 if results:
@@ -153,9 +156,8 @@ if search_query:
 
                 st.subheader(f"Item Name Results ({len(results)})")
                 if results:
-                    df = pd.DataFrame(results)
                     # Show definition in expandable sections
-                    for idx, row in enumerate(results[:10]):
+                    for row in results[:10]:
                         with st.expander(f"{row.get('INC', 'N/A')} - {row.get('FIIG_TITLE', 'Unknown')}"):
                             st.write(f"**Definition:** {row.get('DEFINITION', 'N/A')}")
                             st.write(f"**Status:** {row.get('INC_STATUS', 'N/A')}")
@@ -8,7 +8,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data_loader import CAGEService
+from data_loader import CAGEService, rows_to_csv
 from database import get_db
 
 st.set_page_config(page_title="CAGE Lookup - PubLog", page_icon="🏢", layout="wide")
@@ -31,17 +31,21 @@ tab1, tab2, tab3 = st.tabs(["🔍 Search", "📍 By Location", "📊 Statistics"
 with tab1:
     st.subheader("Search CAGE Records")
 
-    col1, col2 = st.columns([2, 1])
+    # Inputs apply together on submit (or Enter) instead of re-running per edit
+    with st.form("cage_search_form"):
+        col1, col2 = st.columns([2, 1])
 
-    with col1:
-        search_input = st.text_input(
-            "Search",
-            placeholder="Enter CAGE code, company name, or city...",
-            key="cage_search"
-        )
+        with col1:
+            search_input = st.text_input(
+                "Search",
+                placeholder="Enter CAGE code, company name, or city...",
+                key="cage_search"
+            )
 
-    with col2:
-        search_limit = st.number_input("Max results", min_value=10, max_value=500, value=50)
+        with col2:
+            search_limit = st.number_input("Max results", min_value=10, max_value=500, value=50)
+
+        st.form_submit_button("🔍 Search")
 
     if search_input:
         # Check if it looks like a CAGE code (5 alphanumeric chars)
@@ -81,9 +85,14 @@ with tab1:
                 else:
                     st.info("No results found")
         else:
-            # Text search
+            # Text search; a partial code (with a digit, unlike most names) is
+            # answered by code prefix first
             with st.spinner("Searching..."):
-                results = cage_service.search(search_input, limit=search_limit)
+                results = []
+                if len(search_input) < 5 and search_input.isalnum() and any(c.isdigit() for c in search_input):
+                    results = cage_service.get_by_code_prefix(search_input, limit=search_limit)
+                if not results:
+                    results = cage_service.search(search_input, limit=search_limit)
 
             if results:
                 st.info(f"Found {len(results)} results")
@@ -93,7 +102,7 @@ with tab1:
                 st.dataframe(df, use_container_width=True)
 
                 # Download option
-                csv = df.to_csv(index=False)
+                csv = rows_to_csv(results)
                 st.download_button(
                     "📥 Download Results (CSV)",
                     csv,
@@ -148,7 +157,7 @@ with tab2:
                 st.dataframe(df, use_container_width=True)
 
                 # Download option
-                csv = df.to_csv(index=False)
+                csv = rows_to_csv(results)
                 st.download_button(
                     "📥 Download Results (CSV)",
                     csv,
@@ -8,7 +8,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data_loader import NSNService, FSCService
+from data_loader import NSNService, FSCService, rows_to_csv
 from database import get_db
 
 st.set_page_config(page_title="NSN Lookup - PubLog", page_icon="📦", layout="wide")
@@ -34,31 +34,36 @@ tab1, tab2, tab3 = st.tabs(["🔍 Search Items", "📊 Browse by FSC", "📋 Ite
 with tab1:
     st.subheader("Search NSN/NIIN")
 
-    col1, col2, col3 = st.columns([2, 1, 1])
+    # Inputs apply together on submit (or Enter) instead of re-running per edit
+    with st.form("nsn_search_form"):
+        col1, col2, col3 = st.columns([2, 1, 1])
 
-    with col1:
-        search_input = st.text_input(
-            "Search",
-            placeholder="Enter NIIN (9 digits) or item name...",
-            key="nsn_search"
-        )
+        with col1:
+            search_input = st.text_input(
+                "Search",
+                placeholder="Enter NIIN (9 digits) or item name...",
+                key="nsn_search"
+            )
 
-    with col2:
-        fsc_filter = st.text_input(
-            "Filter by FSC",
-            placeholder="4-digit FSC",
-            max_chars=4
-        )
+        with col2:
+            fsc_filter = st.text_input(
+                "Filter by FSC",
+                placeholder="4-digit FSC",
+                max_chars=4
+            )
 
-    with col3:
-        search_limit = st.number_input("Max results", min_value=10, max_value=500, value=50)
+        with col3:
+            search_limit = st.number_input("Max results", min_value=10, max_value=500, value=50)
+
+        st.form_submit_button("🔍 Search")
 
     if search_input:
         # Check if it looks like a NIIN (9 digits)
         clean_input = search_input.replace("-", "").replace(" ", "")
         if len(clean_input) == 9 and clean_input.isdigit():
             # Direct NIIN lookup
-            result = services["nsn"].get_by_niin(clean_input)
+            detail = services["nsn"].get_full_detail(clean_input)
+            result = detail["basic"]
             if result:
                 st.success(f"Found NIIN: {clean_input}")
 
@@ -88,7 +93,7 @@ with tab1:
                 # Get management data
                 st.markdown("---")
                 st.markdown("### Management Data")
-                mgmt_data = services["nsn"].get_management_data(clean_input)
+                mgmt_data = detail["management"]
                 if mgmt_data:
                     mgmt_df = pd.DataFrame(mgmt_data)
                     st.dataframe(mgmt_df, use_container_width=True)
@@ -97,7 +102,7 @@ with tab1:
 
                 # Get characteristics
                 st.markdown("### Characteristics")
-                char_data = services["nsn"].get_characteristics(clean_input)
+                char_data = detail["characteristics"]
                 if char_data:
                     char_df = pd.DataFrame(char_data)
                     st.dataframe(char_df, use_container_width=True)
@@ -114,13 +119,17 @@ with tab1:
                 else:
                     st.info("No results found")
         else:
-            # Text search
+            # Text search; a partial NIIN is answered by NIIN prefix first
             with st.spinner("Searching..."):
-                results = services["nsn"].search(
-                    search_input,
-                    fsc=fsc_filter if fsc_filter else None,
-                    limit=search_limit
-                )
+                results = []
+                if clean_input.isdigit() and not fsc_filter:
+                    results = services["nsn"].get_by_niin_prefix(clean_input, limit=search_limit)
+                if not results:
+                    results = services["nsn"].search(
+                        search_input,
+                        fsc=fsc_filter if fsc_filter else None,
+                        limit=search_limit
+                    )
 
             if results:
                 st.info(f"Found {len(results)} items")
@@ -128,7 +137,7 @@ with tab1:
                 st.dataframe(df, use_container_width=True)
 
                 # Download option
-                csv = df.to_csv(index=False)
+                csv = rows_to_csv(results)
                 st.download_button(
                     "📥 Download Results (CSV)",
                     csv,
@@ -183,7 +192,7 @@ with tab2:
             st.dataframe(df, use_container_width=True)
 
             # Download option
-            csv = df.to_csv(index=False)
+            csv = rows_to_csv(items)
             st.download_button(
                 "📥 Download Items (CSV)",
                 csv,
@@ -205,11 +214,12 @@ with tab3:
 
     if niin_input and len(niin_input) == 9:
         # Get all available data for this NIIN
+        detail = services["nsn"].get_full_detail(niin_input)
         col1, col2, col3 = st.columns(3)
 
         with col1:
             st.markdown("#### Basic Info")
-            result = services["nsn"].get_by_niin(niin_input)
+            result = detail["basic"]
             if result:
                 for key, value in result.items():
                     if value:
@@ -219,10 +229,10 @@ with tab3:
 
         with col2:
             st.markdown("#### Management Data")
-            mgmt_data = services["nsn"].get_management_data(niin_input)
+            mgmt_data = detail["management"]
             if mgmt_data:
-                for record in mgmt_data[:5]:  # Show first 5
-                    with st.expander(f"Record {mgmt_data.index(record) + 1}"):
+                for i, record in enumerate(mgmt_data[:5], 1):  # Show first 5
+                    with st.expander(f"Record {i}"):
                         for key, value in record.items():
                             if value:
                                 st.write(f"**{key}:** {value}")
@@ -231,10 +241,10 @@ with tab3:
 
         with col3:
             st.markdown("#### Characteristics")
-            char_data = services["nsn"].get_characteristics(niin_input)
+            char_data = detail["characteristics"]
             if char_data:
-                for record in char_data[:5]:  # Show first 5
-                    with st.expander(f"Characteristic {char_data.index(record) + 1}"):
+                for i, record in enumerate(char_data[:5], 1):  # Show first 5
+                    with st.expander(f"Characteristic {i}"):
                         for key, value in record.items():
                             if value:
                                 st.write(f"**{key}:** {value}")
@@ -2,14 +2,14 @@
 FSC Browser Page - Browse Federal Supply Classifications
 """
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data_loader import FSCService, ItemNameService
+from data_loader import FSCService, ItemNameService, rows_to_csv, rows_to_frame
 from database import get_db
+from config import MIN_TEXT_SEARCH_LENGTH
 
 st.set_page_config(page_title="FSC Browser - PubLog", page_icon="📊", layout="wide")
 
@@ -28,10 +28,27 @@ def get_services():
 
 services = get_services()
 
-# Tabs
-tab1, tab2, tab3 = st.tabs(["📁 Browse Groups & Classes", "🔍 Search FSC", "📝 Item Names (INC)"])
-
-with tab1:
+def fsg_options_for(fsg_rows):
+    """Selectbox label -> FSG code; titles can be NULL in the data"""
+    return {f"{r['FSG']} - {(r.get('FSG_TITLE') or 'Unknown')[:40]}": r['FSG'] for r in fsg_rows}
+
+@st.cache_data(ttl=3600)
+def load_fsg_list():
+    """All FSGs, their selectbox labels and CSV export; static reference data, built once an hour"""
+    fsg_list = services["fsc"].get_all_fsg()
+    fsg_options = fsg_options_for(fsg_list)
+    return fsg_list, fsg_options, rows_to_csv(fsg_list) if fsg_list else b""
+
+@st.cache_data(ttl=3600)
+def load_fsg_classes(fsg):
+    """FSCs in one FSG and their CSV export, so reruns reuse the encoded file"""
+    fsc_list = services["fsc"].get_fsc_by_fsg(fsg)
+    return fsc_list, rows_to_csv(fsc_list) if fsc_list else b""
+
+# Each tab renders in its own fragment, so typing in one tab reruns only that tab
+@st.fragment
+def render_fsg_browser():
+    """Browse Groups & Classes tab"""
     st.subheader("Federal Supply Groups (FSG)")
 
     col1, col2 = st.columns([1, 2])
@@ -39,10 +56,16 @@ with tab1:
     with col1:
         st.markdown("### Supply Groups")
         try:
-            fsg_list = services["fsc"].get_all_fsg()
+            fsg_list, fsg_options, _ = load_fsg_list()
             if fsg_list:
+                # A filter narrows the options in DuckDB, so only matching labels are built and sent
+                fsg_filter = st.text_input("Filter FSGs", placeholder="Code or title, e.g. 58 or 'weapons'")
+                if fsg_filter.strip():
+                    fsg_options = fsg_options_for(services["fsc"].search_fsg(fsg_filter, 50))
+                    if not fsg_options:
+                        st.caption("No FSGs match the filter")
+
                 # Create selection
-                fsg_options = {f"{r['FSG']} - {r.get('FSG_TITLE', 'Unknown')[:40]}": r['FSG'] for r in fsg_list}
                 selected_fsg_label = st.selectbox(
                     "Select a Federal Supply Group",
                     options=list(fsg_options.keys())
@@ -55,22 +78,24 @@ with tab1:
                 selected_fsg = None
         except Exception as e:
             st.error(f"Error loading FSG data: {e}")
-            selected_fsg = None
+            # The classes panel and "Load All" would only repeat the failing query.
+            # Return from this tab's fragment rather than st.stop(), which would
+            # also blank the other tabs and the sidebar.
+            return
 
     with col2:
         if selected_fsg:
             st.markdown(f"### Federal Supply Classes in FSG {selected_fsg}")
 
-            fsc_in_fsg = services["fsc"].get_fsc_by_fsg(selected_fsg)
+            fsc_in_fsg, csv = load_fsg_classes(selected_fsg)
             if fsc_in_fsg:
                 st.info(f"Found {len(fsc_in_fsg)} classes in this group")
 
                 # Display as dataframe
-                fsc_df = pd.DataFrame(fsc_in_fsg)
+                fsc_df = rows_to_frame(fsc_in_fsg)
                 st.dataframe(fsc_df, use_container_width=True)
 
                 # Download option
-                csv = fsc_df.to_csv(index=False)
                 st.download_button(
                     "📥 Download FSC List (CSV)",
                     csv,
@@ -85,12 +110,11 @@ with tab1:
     st.markdown("### All Federal Supply Groups")
     if st.button("Load All FSG Data"):
         try:
-            all_fsg = services["fsc"].get_all_fsg()
+            all_fsg, _, csv = load_fsg_list()
             if all_fsg:
-                fsg_df = pd.DataFrame(all_fsg)
+                fsg_df = rows_to_frame(all_fsg)
                 st.dataframe(fsg_df, use_container_width=True)
 
-                csv = fsg_df.to_csv(index=False)
                 st.download_button(
                     "📥 Download All FSG (CSV)",
                     csv,
@@ -100,7 +124,9 @@ with tab1:
         except Exception as e:
             st.error(f"Error: {e}")
 
-with tab2:
+@st.fragment
+def render_fsc_search():
+    """Search FSC tab"""
     st.subheader("Search Federal Supply Classes")
 
     search_query = st.text_input(
@@ -108,7 +134,9 @@ with tab2:
         placeholder="e.g., 5820 or 'radio' or 'ammunition'..."
     )
 
-    if search_query:
+    if search_query and len(search_query.strip()) < MIN_TEXT_SEARCH_LENGTH and not search_query.strip().isdigit():
+        st.info(f"Type at least {MIN_TEXT_SEARCH_LENGTH} characters to search by name")
+    elif search_query:
         with st.spinner("Searching..."):
             results = services["fsc"].search_fsc(search_query)
 
@@ -116,17 +144,18 @@ with tab2:
             st.success(f"Found {len(results)} matching FSC codes")
 
             # Display results
-            df = pd.DataFrame(results)
+            df = rows_to_frame(results)
             st.dataframe(df, use_container_width=True)
 
-            # Show details for selected FSC
-            if len(results) <= 20:
-                st.markdown("### FSC Details")
-                for fsc in results:
-                    with st.expander(f"FSC {fsc['FSC']} - {fsc.get('FSC_TITLE', 'Unknown')}"):
-                        for key, value in fsc.items():
-                            if value:
-                                st.write(f"**{key}:** {value}")
+            # Details for one picked FSC; only that card is rendered on each rerun
+            st.markdown("### FSC Details")
+            fsc = st.selectbox(
+                "Show details for",
+                results,
+                format_func=lambda r: f"FSC {r['FSC']} - {r.get('FSC_TITLE', 'Unknown')}"
+            )
+            # One markdown block instead of a widget per field
+            st.markdown("\n\n".join(f"**{key}:** {value}" for key, value in fsc.items() if value))
         else:
             st.info("No matching FSC codes found")
 
@@ -140,22 +169,28 @@ with tab2:
         max_chars=4
     )
 
-    if fsc_code and len(fsc_code) == 4:
+    # FSC codes are four digits; get_fsc_by_code answers repeats from the lookup cache
+    if fsc_code and not (len(fsc_code) == 4 and fsc_code.isdigit()):
+        st.info("Enter a 4-digit FSC code")
+    elif fsc_code:
         fsc_info = services["fsc"].get_fsc_by_code(fsc_code)
         if fsc_info:
             st.success(f"Found FSC {fsc_code}")
             col1, col2 = st.columns(2)
             with col1:
-                st.write(f"**FSC Code:** {fsc_info.get('FSC', 'N/A')}")
-                st.write(f"**Name:** {fsc_info.get('FSC_TITLE', 'N/A')}")
+                st.markdown(f"**FSC Code:** {fsc_info.get('FSC', 'N/A')}\n\n"
+                            f"**Name:** {fsc_info.get('FSC_TITLE', 'N/A')}")
             with col2:
-                for key, value in fsc_info.items():
-                    if key not in ['FSC', 'FSC_TITLE'] and value:
-                        st.write(f"**{key}:** {value}")
+                st.markdown("\n\n".join(
+                    f"**{key}:** {value}" for key, value in fsc_info.items()
+                    if key not in ['FSC', 'FSC_TITLE'] and value
+                ))
         else:
             st.warning(f"FSC {fsc_code} not found")
 
-with tab3:
+@st.fragment
+def render_inc_search():
+    """Item Names (INC) tab"""
     st.subheader("Item Name Codes (INC)")
     st.markdown("Search for Item Name Codes that define standardized item nomenclature.")
 
@@ -164,34 +199,44 @@ with tab3:
         placeholder="e.g., 'capacitor' or 'valve' or 'tube'..."
     )
 
-    if inc_search:
+    if inc_search and len(inc_search.strip()) < MIN_TEXT_SEARCH_LENGTH and not inc_search.strip().isdigit():
+        st.info(f"Type at least {MIN_TEXT_SEARCH_LENGTH} characters to search item names")
+    elif inc_search:
         with st.spinner("Searching item names..."):
             results = services["item_name"].search(inc_search, limit=50)
 
         if results:
             st.success(f"Found {len(results)} item names")
 
-            # Display as expandable cards
-            for item in results:
-                title = item.get('FIIG_TITLE', 'Unknown')
-                inc = item.get('INC', 'N/A')
+            # One table for the list, and a detail card only for the picked item,
+            # instead of a full card per result on every rerun
+            st.dataframe(
+                rows_to_frame(results, columns=["INC", "FIIG_TITLE", "INC_STATUS", "FIIG"]),
+                use_container_width=True
+            )
+            item = st.selectbox(
+                "Show details for",
+                results,
+                format_func=lambda r: f"{r.get('INC', 'N/A')} - {r.get('FIIG_TITLE', 'Unknown')}"
+            )
+            title = item.get('FIIG_TITLE', 'Unknown')
+            inc = item.get('INC', 'N/A')
 
-                with st.expander(f"**{inc}** - {title}"):
-                    col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
 
-                    with col1:
-                        st.write(f"**INC:** {inc}")
-                        st.write(f"**Title:** {title}")
-                        st.write(f"**Status:** {item.get('INC_STATUS', 'N/A')}")
-                        st.write(f"**FIIG:** {item.get('FIIG', 'N/A')}")
+            with col1:
+                st.markdown(f"**INC:** {inc}\n\n"
+                            f"**Title:** {title}\n\n"
+                            f"**Status:** {item.get('INC_STATUS', 'N/A')}\n\n"
+                            f"**FIIG:** {item.get('FIIG', 'N/A')}")
 
-                    with col2:
-                        st.write(f"**Concept No:** {item.get('CONCEPT_NO', 'N/A')}")
-                        st.write(f"**Type Code:** {item.get('TYPE_CODE', 'N/A')}")
-                        st.write(f"**Date Est/Canc:** {item.get('DT_ESTB_CANC', 'N/A')}")
+            with col2:
+                st.markdown(f"**Concept No:** {item.get('CONCEPT_NO', 'N/A')}\n\n"
+                            f"**Type Code:** {item.get('TYPE_CODE', 'N/A')}\n\n"
+                            f"**Date Est/Canc:** {item.get('DT_ESTB_CANC', 'N/A')}")
 
-                    st.markdown("**Definition:**")
-                    st.write(item.get('DEFINITION', 'No definition available'))
+            st.markdown("**Definition:**")
+            st.write(item.get('DEFINITION', 'No definition available'))
         else:
             st.info("No matching item names found")
 
@@ -213,19 +258,31 @@ with tab3:
 
             col1, col2 = st.columns(2)
             with col1:
-                st.write(f"**INC:** {inc_info.get('INC', 'N/A')}")
-                st.write(f"**Status:** {inc_info.get('INC_STATUS', 'N/A')}")
-                st.write(f"**FIIG:** {inc_info.get('FIIG', 'N/A')}")
+                st.markdown(f"**INC:** {inc_info.get('INC', 'N/A')}\n\n"
+                            f"**Status:** {inc_info.get('INC_STATUS', 'N/A')}\n\n"
+                            f"**FIIG:** {inc_info.get('FIIG', 'N/A')}")
             with col2:
-                st.write(f"**Concept No:** {inc_info.get('CONCEPT_NO', 'N/A')}")
-                st.write(f"**Type Code:** {inc_info.get('TYPE_CODE', 'N/A')}")
-                st.write(f"**Condition Code:** {inc_info.get('COND_CODE', 'N/A')}")
+                st.markdown(f"**Concept No:** {inc_info.get('CONCEPT_NO', 'N/A')}\n\n"
+                            f"**Type Code:** {inc_info.get('TYPE_CODE', 'N/A')}\n\n"
+                            f"**Condition Code:** {inc_info.get('COND_CODE', 'N/A')}")
 
             st.markdown("**Definition:**")
             st.info(inc_info.get('DEFINITION', 'No definition available'))
         else:
             st.warning(f"INC {inc_code} not found")
 
+# Tabs
+tab1, tab2, tab3 = st.tabs(["📁 Browse Groups & Classes", "🔍 Search FSC", "📝 Item Names (INC)"])
+
+with tab1:
+    render_fsg_browser()
+
+with tab2:
+    render_fsc_search()
+
+with tab3:
+    render_inc_search()
+
 # Sidebar info
 with st.sidebar:
     st.markdown("### About FSC")
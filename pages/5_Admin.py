@@ -5,19 +5,157 @@ import streamlit as st
 import pandas as pd
 import sys
 from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data_loader import DataLoader
+from data_loader import DataLoader, rows_to_frame
 from database import get_db, PubLogDatabase
-from config import DATA_FILES, DB_PATH, API_PORT
+from config import DATA_FILES, TABLE_PATHS, PRIORITY_TABLES, DB_PATH, API_PORT
 
 st.set_page_config(page_title="Admin - PubLog", page_icon="⚙️", layout="wide")
 
 st.title("⚙️ Admin Dashboard")
 st.markdown("Database management, indexing, and system monitoring.")
 
+@st.cache_data(ttl=30)
+def data_file_sizes():
+    """Size in bytes of each PubLog data file, None if missing; reruns reuse it"""
+    return {
+        name: path.stat().st_size if path.exists() else None
+        for files in DATA_FILES.values()
+        for name, path in files.items()
+    }
+
+@st.cache_resource
+def indexing_job():
+    """The background Priority/Full indexing run, shared by every session
+
+    It lives outside the script thread so a 30-60 minute load neither blocks
+    the page nor stops when the tab is closed; reopening Admin picks it up.
+    """
+    return {
+        "executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix="admin-index"),
+        "future": None,
+        "label": None,
+        "total": 0,
+        "done": {},
+    }
+
+def start_indexing(label, priority_only, force):
+    """Submit initialize_database to the job's executor, recording each finished table"""
+    job = indexing_job()
+    job["label"] = label
+    job["total"] = len(PRIORITY_TABLES if priority_only else TABLE_PATHS)
+    job["done"] = {}
+    job["future"] = job["executor"].submit(
+        DataLoader().initialize_database,
+        force=force,
+        priority_only=priority_only,
+        on_table_done=job["done"].__setitem__
+    )
+
+def is_indexing():
+    """Whether the background indexing job is still going"""
+    job = indexing_job()
+    return job["future"] is not None and not job["future"].done()
+
+job_running = is_indexing()
+
+@st.fragment
+def render_flisv_index(flisv_path):
+    """FLISV index button; the load and its progress polling rerun only this fragment"""
+    db = get_db()
+    force_flisv = st.checkbox("Force re-index", key="force_flisv")
+
+    # Fragment reruns skip the page script, so check the background job here
+    ready = flisv_path and flisv_path.exists() and not is_indexing()
+    if st.button("🚀 Index NSN Data", type="primary", disabled=not ready):
+        progress_bar = st.progress(0, text="Starting indexing...")
+
+        try:
+            # Load in a worker thread and poll DuckDB's progress estimate meanwhile
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(db.index_csv_file, "FLISV", flisv_path, force_flisv)
+                while not future.done():
+                    progress = db.load_progress("FLISV")
+                    if progress is not None:
+                        progress_bar.progress(min(99, int(progress)),
+                                              text=f"Loading FLISV.CSV (~2.2 GB)... {progress:.0f}%")
+                    time.sleep(0.5)
+                success = future.result()
+
+            progress_bar.progress(100, text="Complete!")
+
+            if success:
+                DataLoader().build_search_indexes("FLISV")
+                info = db.get_table_info("FLISV")
+                st.success(f"✅ Successfully indexed FLISV: {info.get('row_count', 0):,} rows")
+                st.balloons()
+            else:
+                st.error("❌ Failed to index FLISV")
+        except Exception as e:
+            st.error(f"Error: {e}")
+
+def render_bulk_indexing():
+    """Priority/Full index buttons and the background job's progress
+
+    Run as a fragment that reruns itself while the job is going, so polling
+    does not redraw the whole page; the page reruns once when the job ends.
+    """
+    job = indexing_job()
+    running = is_indexing()
+    if job_running and not running:
+        st.rerun()
+
+    if job["future"] is not None:
+        done = dict(job["done"])
+        if running:
+            st.progress(len(done) / max(job["total"], 1),
+                        text=f"{job['label']}: {len(done)}/{job['total']} tables loaded")
+            st.caption("Indexing continues if you leave this page; come back to check on it.")
+        else:
+            try:
+                result = job["future"].result()
+                if result["success"]:
+                    st.success(f"✅ {job['label']}: indexed {result['indexed']}/{result['total']} tables")
+                else:
+                    st.warning(f"⚠️ {job['label']}: indexed {result['indexed']}/{result['total']} tables (some failed)")
+            except Exception as e:
+                st.error(f"Indexing error: {e}")
+        if done:
+            with st.expander("Indexing Details"):
+                for table, success in done.items():
+                    if success:
+                        st.write(f"✅ {table}")
+                    else:
+                        st.write(f"❌ {table}")
+
+    # Priority Tables
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### Quick Index (Priority Tables)")
+        st.caption("Reference data: CAGE codes, FSC classifications, item names")
+        force_priority = st.checkbox("Force re-index (priority)", key="force_priority")
+
+        if st.button("Index Priority Tables", type="secondary", disabled=running):
+            start_indexing("Priority tables", True, force_priority)
+            st.rerun()
+
+    with col2:
+        st.markdown("### Full Index (All Tables)")
+        st.caption("Includes characteristics, parts, management data (~8 GB)")
+        st.warning("⚠️ This may take 30-60 minutes!")
+
+        force_full = st.checkbox("Force re-index (all)", key="force_full")
+
+        if st.button("Index All Tables", disabled=running):
+            start_indexing("All tables", False, force_full)
+            st.rerun()
+
 # Tabs
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Status", "🗄️ Database", "🔧 Indexing", "📡 API Info"])
 
@@ -28,7 +166,8 @@ with tab1:
 
     try:
         db = get_db()
-        stats = db.get_database_stats()
+        # Exact counts scan every table, which competes with a running load
+        stats = db.get_database_stats(precise=not job_running)
         tables = db.get_indexed_tables()
 
         with col1:
@@ -44,9 +183,10 @@ with tab1:
         st.markdown("---")
         st.markdown("### Database File")
         if DB_PATH.exists():
+            db_stat = DB_PATH.stat()
             st.success(f"✅ Database file exists: `{DB_PATH}`")
-            st.write(f"**Size:** {DB_PATH.stat().st_size / (1024*1024):.2f} MB")
-            st.write(f"**Modified:** {datetime.fromtimestamp(DB_PATH.stat().st_mtime)}")
+            st.write(f"**Size:** {db_stat.st_size / (1024*1024):.2f} MB")
+            st.write(f"**Modified:** {datetime.fromtimestamp(db_stat.st_mtime)}")
         else:
             st.warning("⚠️ Database file not found. Run indexing to create it.")
 
@@ -54,7 +194,7 @@ with tab1:
         st.markdown("---")
         st.markdown("### Indexed Tables")
         if stats.get("tables"):
-            table_df = pd.DataFrame(stats["tables"])
+            table_df = rows_to_frame(stats["tables"])
             table_df["rows"] = table_df["rows"].apply(lambda x: f"{x:,}")
             st.dataframe(table_df, use_container_width=True)
         else:
@@ -73,11 +213,12 @@ with tab2:
         st.markdown("### Available Data Files")
 
         # Count files by category
+        file_sizes = data_file_sizes()
         for category, files in DATA_FILES.items():
             with st.expander(f"📁 {category.upper()} ({len(files)} files)"):
-                for name, path in files.items():
-                    if path.exists():
-                        size_mb = path.stat().st_size / (1024 * 1024)
+                for name in files:
+                    if file_sizes.get(name) is not None:
+                        size_mb = file_sizes[name] / (1024 * 1024)
                         st.write(f"✅ **{name}**: {size_mb:.1f} MB")
                     else:
                         st.write(f"❌ **{name}**: File not found")
@@ -109,12 +250,15 @@ with tab2:
         if st.button("Execute") and query:
             try:
                 db = get_db()
-                results = db.query(f"{query} LIMIT 100")
+                # Same check as the API: one SELECT, capped at 100 rows
+                results = db.query(db.prepare_select(query, 100))
                 if results:
                     df = pd.DataFrame(results)
                     st.dataframe(df, use_container_width=True)
                 else:
                     st.info("Query returned no results")
+            except ValueError as e:
+                st.warning(f"Query not allowed: {e}")
             except Exception as e:
                 st.error(f"Query error: {e}")
 
@@ -167,7 +311,7 @@ with tab3:
 
     with col1:
         # Show file info
-        flisv_path = DATA_FILES.get("large_files", {}).get("FLISV")
+        flisv_path = TABLE_PATHS.get("FLISV")
         if flisv_path and flisv_path.exists():
             size_gb = flisv_path.stat().st_size / (1024**3)
             st.write(f"**File:** FLISV.CSV ({size_gb:.2f} GB)")
@@ -180,86 +324,24 @@ with tab3:
         else:
             st.warning("FLISV.CSV file not found")
 
-    with col2:
-        force_flisv = st.checkbox("Force re-index", key="force_flisv")
-
-        if st.button("🚀 Index NSN Data", type="primary", disabled=not (flisv_path and flisv_path.exists())):
-            progress_bar = st.progress(0, text="Starting indexing...")
-
-            try:
-                progress_bar.progress(10, text="Loading FLISV.CSV (~2.2 GB)...")
-
-                success = db.index_csv_file("FLISV", flisv_path, force=force_flisv)
-
-                progress_bar.progress(100, text="Complete!")
-
-                if success:
-                    info = db.get_table_info("FLISV")
-                    st.success(f"✅ Successfully indexed FLISV: {info.get('row_count', 0):,} rows")
-                    st.balloons()
-                else:
-                    st.error("❌ Failed to index FLISV")
-            except Exception as e:
-                st.error(f"Error: {e}")
-
-    st.markdown("---")
-
-    # Priority Tables
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("### Quick Index (Priority Tables)")
-        st.caption("Reference data: CAGE codes, FSC classifications, item names")
-        force_priority = st.checkbox("Force re-index (priority)", key="force_priority")
-
-        if st.button("Index Priority Tables", type="secondary"):
-            with st.spinner("Indexing priority tables... This may take several minutes."):
-                try:
-                    loader = DataLoader()
-                    result = loader.initialize_database(force=force_priority, priority_only=True)
-
-                    if result["success"]:
-                        st.success(f"✅ Successfully indexed {result['indexed']}/{result['total']} tables")
-                    else:
-                        st.warning(f"⚠️ Indexed {result['indexed']}/{result['total']} tables (some failed)")
-
-                    # Show details
-                    with st.expander("Indexing Details"):
-                        for table, success in result["details"].items():
-                            if success:
-                                st.write(f"✅ {table}")
-                            else:
-                                st.write(f"❌ {table}")
-                except Exception as e:
-                    st.error(f"Indexing error: {e}")
+        with st.expander("Performance options"):
+            # The CSV reader parses in parallel across all DuckDB threads;
+            # insertion order is only dropped while a load is running
+            settings = db.query(
+                "SELECT name, value FROM duckdb_settings() "
+                "WHERE name IN ('threads', 'memory_limit', 'temp_directory')"
+            )
+            for row in settings:
+                st.write(f"**{row['name']}:** {row['value'] or 'default'}")
+            st.write("**preserve_insertion_order:** false during loads")
 
     with col2:
-        st.markdown("### Full Index (All Tables)")
-        st.caption("Includes characteristics, parts, management data (~8 GB)")
-        st.warning("⚠️ This may take 30-60 minutes!")
-
-        force_full = st.checkbox("Force re-index (all)", key="force_full")
+        render_flisv_index(flisv_path)
 
-        if st.button("Index All Tables"):
-            with st.spinner("Indexing all tables... This may take 30-60 minutes for large files."):
-                try:
-                    loader = DataLoader()
-                    result = loader.initialize_database(force=force_full, priority_only=False)
+    st.markdown("---")
 
-                    if result["success"]:
-                        st.success(f"✅ Successfully indexed {result['indexed']}/{result['total']} tables")
-                    else:
-                        st.warning(f"⚠️ Indexed {result['indexed']}/{result['total']} tables (some failed)")
-
-                    # Show details
-                    with st.expander("Indexing Details"):
-                        for table, success in result["details"].items():
-                            if success:
-                                st.write(f"✅ {table}")
-                            else:
-                                st.write(f"❌ {table}")
-                except Exception as e:
-                    st.error(f"Indexing error: {e}")
+    # Polls itself every two seconds while a background job runs
+    st.fragment(render_bulk_indexing, run_every=2 if job_running else None)()
 
     # Index specific table
     st.markdown("---")
@@ -268,33 +350,27 @@ with tab3:
     col1, col2 = st.columns(2)
 
     with col1:
-        # Build list of available tables
-        available_tables = []
-        for category, files in DATA_FILES.items():
-            for name, path in files.items():
-                if path.exists():
-                    available_tables.append(name)
+        # Build list of available tables from the cached file scan (Refresh Status rescans)
+        available_tables = [name for name, size in data_file_sizes().items() if size is not None]
 
         selected_table = st.selectbox("Select table", available_tables)
 
     with col2:
         force_single = st.checkbox("Force re-index", key="force_single")
 
-    if st.button("Index Selected Table"):
-        all_files = {}
-        for category, files in DATA_FILES.items():
-            all_files.update(files)
-
-        if selected_table in all_files:
+    if st.button("Index Selected Table", disabled=job_running):
+        if selected_table in TABLE_PATHS:
             with st.spinner(f"Indexing {selected_table}..."):
                 try:
                     db = get_db()
                     success = db.index_csv_file(
                         selected_table,
-                        all_files[selected_table],
+                        TABLE_PATHS[selected_table],
                         force=force_single
                     )
                     if success:
+                        # Loading dropped the table's full-text and prefix indexes
+                        DataLoader().build_search_indexes(selected_table)
                         st.success(f"✅ Successfully indexed {selected_table}")
                     else:
                         st.error(f"❌ Failed to index {selected_table}")
@@ -348,8 +424,16 @@ with st.sidebar:
     st.markdown("### Quick Actions")
 
     if st.button("🔄 Refresh Status"):
+        # Stats are cached for STATS_CACHE_TTL; a refresh should recount now
+        get_db().clear_stats_cache()
+        data_file_sizes.clear()
         st.rerun()
 
+    if st.button("🧹 Clear Query Caches"):
+        get_db().clear_caches()
+        st.cache_data.clear()
+        st.success("Cached lookups and search results cleared")
+
     st.markdown("---")
     st.markdown("### System Info")
     st.write(f"**Database:** `{DB_PATH.name}`")
@@ -7,6 +7,7 @@ import subprocess
 import sys
 import os
 import signal
+import socket
 import time
 from pathlib import Path
 
@@ -31,6 +32,40 @@ def run_api():
          "--port", "8000"],
     )
 
+def wait_until_listening(process, port, timeout=60):
+    """Wait until a server accepts connections on localhost:port
+
+    Returns False if the process exits first or the timeout passes.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("localhost", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def wait_for_exit(*processes):
+    """Block until one of the child processes exits
+
+    On POSIX this sleeps in the kernel until a child exits (WNOWAIT leaves
+    it for Popen to reap); signals still interrupt the wait. The poll()
+    check comes first because a child reaped during startup is invisible
+    to waitid, which would otherwise block on the survivor. Windows has
+    no waitid, so it falls back to polling once a second.
+    """
+    while all(process.poll() is None for process in processes):
+        if not hasattr(os, "waitid"):
+            time.sleep(1)
+            continue
+        try:
+            os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOWAIT)
+        except ChildProcessError:
+            return
+
 def main():
     print("=" * 60)
     print("PubLog Application")
@@ -39,12 +74,13 @@ def main():
     print("Starting services...")
     print()
 
-    # Start both servers
+    # Start both servers together and report once each is accepting connections
     api_process = run_api()
-    time.sleep(2)  # Give API time to start
     streamlit_process = run_streamlit()
 
-    time.sleep(3)  # Give Streamlit time to start
+    for name, process, port in (("API", api_process, 8000), ("Streamlit", streamlit_process, 8501)):
+        if not wait_until_listening(process, port):
+            print(f"{name} server did not start on port {port}")
 
     print("Services started:")
     print(f"  📊 Streamlit UI:  http://localhost:8501")
@@ -65,15 +101,11 @@ def main():
 
     # Wait for processes
     try:
-        while True:
-            # Check if processes are still running
-            if api_process.poll() is not None:
-                print("API server stopped unexpectedly")
-                break
-            if streamlit_process.poll() is not None:
-                print("Streamlit server stopped unexpectedly")
-                break
-            time.sleep(1)
+        wait_for_exit(api_process, streamlit_process)
+        if api_process.poll() is not None:
+            print("API server stopped unexpectedly")
+        if streamlit_process.poll() is not None:
+            print("Streamlit server stopped unexpectedly")
     except KeyboardInterrupt:
         pass
     finally:
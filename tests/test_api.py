@@ -0,0 +1,90 @@
+"""
+API response caching: repeat GETs from memory and ETag revalidation
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+import api
+import database
+from config import API_PREFIX
+from database import PubLogDatabase
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._db_path = database.DB_PATH
+        database.DB_PATH = Path(self._tmp.name) / "publog.duckdb"
+        PubLogDatabase._instance = None
+        self.db = database.get_db()
+        self.db.clear_caches()
+        self.db.conn.execute("""
+            CREATE TABLE P_CAGE AS SELECT * FROM (VALUES ('1ABC2', 'ACME RADIO'))
+            t(CAGE_CODE, COMPANY)
+        """)
+        # Reference listings preloaded on startup
+        self.db.conn.execute("CREATE TABLE V_H2_FSC AS SELECT 5820 AS FSC, 'RADIO EQUIPMENT' AS FSC_TITLE")
+        self.db.conn.execute("CREATE TABLE V_H2_FSG AS SELECT 5800 AS FSC, 'COMMUNICATION EQUIPMENT' AS FSG_TITLE")
+        api.response_cache.clear()
+        self.client = TestClient(api.app)
+        self.client.__enter__()
+
+    def tearDown(self):
+        self.client.__exit__(None, None, None)
+        api.response_cache.clear()
+        self.db.conn.close()
+        self.db.clear_caches()
+        PubLogDatabase._instance = None
+        database.DB_PATH = self._db_path
+        self._tmp.cleanup()
+
+    def rename(self, company):
+        self.db.conn.execute("UPDATE P_CAGE SET COMPANY = ?", [company])
+        self.db.clear_caches()
+
+    def test_repeat_get_served_from_cache(self):
+        url = f"{API_PREFIX}/cage/1ABC2"
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["COMPANY"], "ACME RADIO")
+        self.assertTrue(first.headers["cache-control"].startswith("max-age="))
+
+        self.rename("ACME TV")
+        self.assertEqual(self.client.get(url).json()["COMPANY"], "ACME RADIO")
+
+        api.response_cache.clear()
+        self.assertEqual(self.client.get(url).json()["COMPANY"], "ACME TV")
+
+    def test_errors_are_not_cached(self):
+        url = f"{API_PREFIX}/cage/9ZZZ9"
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.db.conn.execute("INSERT INTO P_CAGE VALUES ('9ZZZ9', 'LATE ENTRY')")
+        self.db.clear_caches()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_etag_revalidation(self):
+        url = f"{API_PREFIX}/cage/1ABC2"
+        etag = self.client.get(url).headers["etag"]
+
+        # Answered from the response cache, then by the endpoint itself
+        for clear in (False, True):
+            if clear:
+                api.response_cache.clear()
+            response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["etag"], etag)
+            self.assertEqual(response.content, b"")
+
+        self.assertEqual(self.client.get(url, headers={"If-None-Match": 'W/"stale"'}).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+PubLogDatabase query helpers: user-query validation, result caches and
+the Parquet copy used to reload tables
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+from database import PubLogDatabase
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Points the database singleton at a throwaway file for each test"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+        self._db_path = database.DB_PATH
+        database.DB_PATH = self.tmp_path / "publog.duckdb"
+        PubLogDatabase._instance = None
+        self.db = database.get_db()
+        self.db.clear_caches()
+
+    def tearDown(self):
+        self.db.conn.close()
+        self.db.clear_caches()
+        PubLogDatabase._instance = None
+        database.DB_PATH = self._db_path
+        self._tmp.cleanup()
+
+
+class PrepareSelectTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.conn.execute("CREATE TABLE T AS SELECT range AS i FROM range(10)")
+
+    def rows(self, sql, limit):
+        return [r["i"] for r in self.db.query(self.db.prepare_select(sql, limit))]
+
+    def test_rejects_anything_but_one_select(self):
+        for sql in ("DROP TABLE T", "INSERT INTO T VALUES (1)", "SELECT 1; DROP TABLE T",
+                    "COPY T TO 'out.csv'", "SELEC 1"):
+            with self.subTest(sql=sql):
+                with self.assertRaises(ValueError):
+                    self.db.prepare_select(sql, 5)
+
+    def test_appends_limit(self):
+        self.assertEqual(self.rows("SELECT i FROM T ORDER BY i", 3), [0, 1, 2])
+
+    def test_trailing_comment_and_semicolon_keep_limit(self):
+        self.assertEqual(self.rows("SELECT i FROM T ORDER BY i; -- all of them", 2), [0, 1])
+
+    def test_caps_query_with_larger_limit(self):
+        self.assertEqual(self.rows("SELECT i FROM T ORDER BY i LIMIT 1000", 4), [0, 1, 2, 3])
+
+    def test_keeps_smaller_limit_and_offset(self):
+        self.assertEqual(self.rows("SELECT i FROM T ORDER BY i LIMIT 2 OFFSET 5", 4), [5, 6])
+
+    def test_limit_in_subquery_or_literal_does_not_count(self):
+        self.assertEqual(self.rows("SELECT i FROM (SELECT i FROM T ORDER BY i LIMIT 8) ORDER BY i", 3),
+                         [0, 1, 2])
+        sql = self.db.prepare_select("SELECT 'LIMIT 1' AS s, i FROM T", 3)
+        self.assertEqual(len(self.db.query(sql)), 3)
+
+
+class QueryCacheTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.conn.execute("CREATE TABLE T (code VARCHAR, name VARCHAR)")
+        self.db.conn.execute("INSERT INTO T VALUES ('A', 'old')")
+
+    def test_results_cached_until_clear_caches(self):
+        sql, params = "SELECT name FROM T WHERE code = ?", ["A"]
+        for method in (self.db.query_cached, self.db.query_search):
+            with self.subTest(method=method.__name__):
+                self.db.conn.execute("UPDATE T SET name = 'old'")
+                self.db.clear_caches()
+                self.assertEqual(method(sql, params), [{"name": "old"}])
+
+                self.db.conn.execute("UPDATE T SET name = 'new'")
+                self.assertEqual(method(sql, params), [{"name": "old"}])
+
+                self.db.clear_caches()
+                self.assertEqual(method(sql, params), [{"name": "new"}])
+
+    def test_callers_get_copies(self):
+        rows = self.db.query_cached("SELECT name FROM T")
+        rows[0]["name"] = "changed"
+        self.assertEqual(self.db.query_cached("SELECT name FROM T"), [{"name": "old"}])
+
+
+class ParquetCopyTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self._parquet_dir = database.PARQUET_CACHE_DIR
+        database.PARQUET_CACHE_DIR = self.tmp_path / "parquet"
+        self.csv_path = self.tmp_path / "T_CODES.CSV"
+        self.csv_path.write_text("CODE,NAME\nB,two\nA,one\n")
+
+    def tearDown(self):
+        database.TABLE_SORT_KEYS.pop("T_CODES", None)
+        database.PARQUET_CACHE_DIR = self._parquet_dir
+        super().tearDown()
+
+    def codes(self):
+        return [r["CODE"] for r in self.db.query("SELECT CODE FROM T_CODES")]
+
+    def test_reload_reads_copy_written_by_first_load(self):
+        self.assertTrue(self.db.index_csv_file("T_CODES", self.csv_path))
+        copy = self.db._parquet_copy("T_CODES", self.csv_path)
+        self.assertIsNotNone(copy)
+
+        # A newer CSV invalidates the copy
+        os.utime(copy, (0, 0))
+        self.assertIsNone(self.db._parquet_copy("T_CODES", self.csv_path))
+
+    def test_forced_reload_and_new_sort_keys_skip_old_copy(self):
+        self.assertTrue(self.db.index_csv_file("T_CODES", self.csv_path))
+        self.csv_path.write_text("CODE,NAME\nC,three\n")
+        os.utime(self.csv_path, (0, 0))
+        self.assertTrue(self.db.index_csv_file("T_CODES", self.csv_path, force=True))
+        self.assertEqual(self.codes(), ["C"])
+
+        self.csv_path.write_text("CODE,NAME\nB,two\nA,one\n")
+        os.utime(self.csv_path, (0, 0))
+        database.TABLE_SORT_KEYS["T_CODES"] = ["CODE"]
+        self.assertIsNone(self.db._parquet_copy("T_CODES", self.csv_path))
+        self.assertTrue(self.db.index_csv_file("T_CODES", self.csv_path, force=True))
+        self.assertEqual(self.codes(), ["A", "B"])
+        self.assertEqual(len(list(database.PARQUET_CACHE_DIR.iterdir())), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Search queries that take the full-text (BM25) path
+
+The fts extension may not be installable offline, so each test database
+gets an fts_main_<table> schema with a stand-in match_bm25 macro, which is
+all the services look for. Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+from database import PubLogDatabase
+from data_loader import CAGEService, NSNService
+
+
+class FTSSearchTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._db_path = database.DB_PATH
+        database.DB_PATH = Path(self._tmp.name) / "publog.duckdb"
+        PubLogDatabase._instance = None
+        self.db = database.get_db()
+        self.db.clear_caches()
+        self.db.conn.execute("""
+            CREATE TABLE P_CAGE AS SELECT * FROM (VALUES
+                ('1ABC2', 'A', '1', 'X', 'ACME RADIO', 'AUSTIN', 'TX', 'TX', '78701', 'US'),
+                ('3DEF4', 'A', '1', 'X', 'ACME ANTENNA', 'DENVER', 'CO', 'CO', '80202', 'US')
+            ) t(CAGE_CODE, CAGE_STATUS, TYPE, CAO, COMPANY, CITY, STATE_PROVINCE,
+                STATE_PROVINCE_UC, ZIP_POSTAL_ZONE, COUNTRY)
+        """)
+        self.db.conn.execute("""
+            CREATE TABLE P_FLIS_NSN AS SELECT * FROM (VALUES
+                (5820, '000000001', 'RADIO SET', '00001', 'A'),
+                (5821, '000000002', 'RADIO SET', '00001', 'A')
+            ) t(FSC, NIIN, ITEM_NAME, INC, EXTRA)
+        """)
+        for table in ("P_CAGE", "P_FLIS_NSN"):
+            self.db.conn.execute(f"CREATE SCHEMA fts_main_{table}")
+            # Ranks the Denver CAGE first, like a better text match would
+            self.db.conn.execute(
+                f"CREATE MACRO fts_main_{table}.match_bm25(id, q) AS CASE WHEN id = '3DEF4' THEN 2.0 ELSE 1.0 END"
+            )
+
+    def tearDown(self):
+        self.db.conn.close()
+        self.db.clear_caches()
+        PubLogDatabase._instance = None
+        database.DB_PATH = self._db_path
+        self._tmp.cleanup()
+
+    def test_cage_search_filters_state_outside_display_columns(self):
+        results = CAGEService().search("acme", state="tx")
+        self.assertEqual([r["CAGE_CODE"] for r in results], ["1ABC2"])
+
+    def test_cage_state_filter_runs_before_limit(self):
+        # The CO row ranks and sorts first; filtering after LIMIT 1 would drop the TX row
+        self.assertEqual([r["CAGE_CODE"] for r in CAGEService().search("acme", limit=1, state="TX")],
+                         ["1ABC2"])
+
+        # Same through the LIKE path once the full-text index is gone
+        self.db.conn.execute("DROP SCHEMA fts_main_P_CAGE CASCADE")
+        self.db.clear_caches()
+        self.assertEqual([r["CAGE_CODE"] for r in CAGEService().search("acme", limit=1, state="TX")],
+                         ["1ABC2"])
+
+    def test_nsn_search_filters_fsc(self):
+        results = NSNService().search("radio", fsc="5821")
+        self.assertEqual([r["NIIN"] for r in results], ["000000002"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Code lookups in the data services: partial CAGE/NIIN prefixes and the
+numeric FSC/FSG branches
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+from config import CODE_KEY_TABLES
+from database import PubLogDatabase
+from data_loader import CAGEService, DataLoader, FSCService, NSNService
+
+
+class ServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._db_path = database.DB_PATH
+        database.DB_PATH = Path(self._tmp.name) / "publog.duckdb"
+        PubLogDatabase._instance = None
+        self.db = database.get_db()
+        self.db.clear_caches()
+
+    def tearDown(self):
+        self.db.conn.close()
+        self.db.clear_caches()
+        PubLogDatabase._instance = None
+        database.DB_PATH = self._db_path
+        self._tmp.cleanup()
+
+
+class CodePrefixTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        # Neighbours on both sides of each prefix range
+        self.db.conn.execute("""
+            CREATE TABLE P_CAGE AS SELECT * FROM (VALUES
+                ('1AAZZ', 'A'), ('1AB00', 'A'), ('1ABZZ', 'A'), ('1AC00', 'A'), ('1AZ99', 'A'), ('1B000', 'A')
+            ) t(CAGE_CODE, CAGE_STATUS)
+        """)
+        self.db.conn.execute("""
+            CREATE TABLE P_FLIS_NSN AS SELECT * FROM (VALUES
+                (5820, '012299999', 'RADIO'), (5820, '012300000', 'RADIO'), (5820, '012399999', 'RADIO'),
+                (5820, '012400000', 'RADIO'), (5820, '019999999', 'RADIO'), (5820, '020000000', 'RADIO')
+            ) t(FSC, NIIN, ITEM_NAME)
+        """)
+
+    def check_bounds(self):
+        cage = CAGEService()
+        nsn = NSNService()
+        self.assertEqual([r["CAGE_CODE"] for r in cage.get_by_code_prefix(" 1ab")], ["1AB00", "1ABZZ"])
+        # The last character rolls over to the next one: Z -> [, 9 -> :
+        self.assertEqual([r["CAGE_CODE"] for r in cage.get_by_code_prefix("1AZ")], ["1AZ99"])
+        self.assertEqual([r["CAGE_CODE"] for r in cage.get_by_code_prefix("1AB", limit=1)], ["1AB00"])
+        self.assertEqual([r["NIIN"] for r in nsn.get_by_niin_prefix("0123")], ["012300000", "012399999"])
+        self.assertEqual([r["NIIN"] for r in nsn.get_by_niin_prefix("019")], ["019999999"])
+        self.assertEqual(cage.get_by_code_prefix("  "), [])
+
+    def test_bounds_on_source_tables(self):
+        self.check_bounds()
+
+    def test_bounds_on_key_tables(self):
+        DataLoader()._create_derived_schema()
+        DataLoader()._create_code_key_tables()
+        for key_table, _ in CODE_KEY_TABLES.values():
+            self.assertTrue(self.db.is_table_indexed(key_table))
+        self.check_bounds()
+
+
+class FSCCodeTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.conn.execute("""
+            CREATE TABLE V_H2_FSC AS SELECT * FROM (VALUES
+                (5805, 'TELEPHONE EQUIPMENT'), (5820, 'RADIO EQUIPMENT'), (5905, 'RESISTORS')
+            ) t(FSC, FSC_TITLE)
+        """)
+
+    def test_get_fsc_by_code(self):
+        fsc = FSCService()
+        self.assertEqual(fsc.get_fsc_by_code(" 5820 ")["FSC_TITLE"], "RADIO EQUIPMENT")
+        self.assertIsNone(fsc.get_fsc_by_code("58X0"))
+
+    def test_get_fsc_by_fsg(self):
+        fsc = FSCService()
+        self.assertEqual([r["FSC"] for r in fsc.get_fsc_by_fsg(58)], [5805, 5820])
+        self.assertEqual([r["FSC"] for r in fsc.get_fsc_by_fsg("59")], [5905])
+        self.assertEqual(fsc.get_fsc_by_fsg("5x"), [])
+
+    def test_search_fsc_by_number_or_title(self):
+        fsc = FSCService()
+        self.assertEqual([r["FSC"] for r in fsc.search_fsc("5905")], [5905])
+        self.assertEqual([r["FSC"] for r in fsc.search_fsc("radio")], [5820])
+
+
+if __name__ == "__main__":
+    unittest.main()